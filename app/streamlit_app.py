@@ -4,6 +4,7 @@
 # ==============================================================================
 import sys
 import os
+from functools import lru_cache
 
 # 1. Detectamos la ubicación física exacta de este archivo (streamlit_app.py)
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,6 +18,7 @@ if ROOT_DIR not in sys.path:
 
 # --- A PARTIR DE AQUÍ VAN TUS IMPORTACIONES ORIGINALES ---
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
@@ -49,7 +51,28 @@ st.set_page_config(
 
 # ──────────────────────────────────────────────────────────────
 # Aplicar diseño Evangelista
-st.markdown(get_custom_css(), unsafe_allow_html=True)
+@st.cache_resource
+def get_app_css() -> str:
+    """CSS Evangelista + overrides del portal, armado una sola vez por proceso.
+    Se sigue emitiendo en cada rerun: Streamlit descarta los elementos no re-emitidos."""
+    return get_custom_css() + """
+        <style>
+            [data-testid="stSidebarNav"] {display: none !important;}
+            .stButton>button { border: 1px solid #D4AF37; background-color: transparent; }
+            .stButton>button:hover { border: 1px solid #1A1A2E; color: #1A1A2E; }
+            [data-testid="stSidebar"] p, [data-testid="stSidebar"] span, 
+            [data-testid="stSidebar"] label, [data-testid="stSidebar"] h3, 
+            [data-testid="stSidebar"] strong { color: #FFFFFF !important; }
+            div[data-baseweb="base-input"], div[data-baseweb="select"] > div {
+                background-color: #FFFFFF !important; border: 1px solid #D4AF37 !important; border-radius: 4px;
+            }
+            div[data-baseweb="base-input"] input, div[data-baseweb="select"] div {
+                color: #1A1A2E !important; -webkit-text-fill-color: #1A1A2E !important;
+            }
+        </style>
+    """
+
+st.markdown(get_app_css(), unsafe_allow_html=True)
 get_evangelista_theme()
 # ──────────────────────────────────────────────────────────────
 
@@ -124,19 +147,37 @@ def load_pipeline(client_file: str):
     
 @st.cache_data
 def run_pipeline(_pipeline):
-    return _pipeline.execute()
+    results = _pipeline.execute()
+    # Outcomes como ndarray tipado, materializado una sola vez para todas las vistas
+    results['outcome_np'] = results['simulation_results']['outcome'].to_numpy()
+    return results
 
 # ═══════════════════════════════════════════════════════════════
 # FUNCIONES DE VISUALIZACIÓN
 # ═══════════════════════════════════════════════════════════════
 
+_GAUGE_COLORS = ("green", "orange", "red")
+
+@lru_cache(maxsize=64)
+def _gauge_steps(range_max: float, threshold: float) -> tuple:
+    """Bandas verde/amarilla/roja del gauge; pares (range_max, threshold) repetidos reutilizan la tupla."""
+    t = threshold * 100 if threshold < 1 else threshold
+    rmax = range_max * 100 if range_max < 1 else range_max
+    return (
+        {'range': [0, t * 0.7], 'color': "lightgreen"},
+        {'range': [t * 0.7, t], 'color': "yellow"},
+        {'range': [t, rmax], 'color': "lightcoral"},
+    )
+
+@st.cache_data(show_spinner=False)
 def render_gauge(value: float, title: str, range_max: float, threshold: float = None):
-    if threshold and value > threshold:
-        color = "red"
-    elif threshold and value > threshold * 0.7:
-        color = "orange"
-    else:
-        color = "green"
+    # 0 = verde, 1 = naranja (> 70% del umbral), 2 = rojo (> umbral)
+    level = (int(value > threshold) * 2 or int(value > threshold * 0.7)) if threshold else 0
+    color = _GAUGE_COLORS[level]
+    
+    # Escala a % una sola vez para eje y threshold
+    t = threshold * 100 if threshold and threshold < 1 else threshold
+    rmax = range_max * 100 if range_max < 1 else range_max
     
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
@@ -144,52 +185,62 @@ def render_gauge(value: float, title: str, range_max: float, threshold: float =
         title={'text': title, 'font': {'size': 20}},
         number={'suffix': '%' if value < 1 else '', 'font': {'size': 36}},
         gauge={
-            'axis': {'range': [0, range_max * 100 if range_max < 1 else range_max]},
+            'axis': {'range': [0, rmax]},
             'bar': {'color': color},
             'threshold': {
                 'line': {'color': "red", 'width': 4},
                 'thickness': 0.75,
-                'value': threshold * 100 if threshold and threshold < 1 else threshold
+                'value': t
             } if threshold else None,
-            'steps': [
-                {'range': [0, (threshold * 100 if threshold and threshold < 1 else threshold) * 0.7], 'color': "lightgreen"},
-                {'range': [(threshold * 100 if threshold and threshold < 1 else threshold) * 0.7, (threshold * 100 if threshold and threshold < 1 else threshold)], 'color': "yellow"},
-                {'range': [(threshold * 100 if threshold and threshold < 1 else threshold), range_max * 100 if range_max < 1 else range_max], 'color': "lightcoral"}
-            ] if threshold else None
+            'steps': _gauge_steps(range_max, threshold) if threshold else None
         }
     ))
-    fig.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10))
+    fig.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10), uirevision='kpi')
     return fig
 
+@st.cache_data(show_spinner=False)
 def render_tornado_chart(sensitivity_df: pd.DataFrame):
-    df = sensitivity_df.sort_values('importance', ascending=True)
+    # sensitivity_analysis() ya entrega orden descendente: se invierte el eje en vez de re-ordenar
     fig = px.bar(
-        df,
+        sensitivity_df,
         x='importance',
         y='variable',
         orientation='h',
         title='Análisis de Sensibilidad - Impacto de Variables',
         labels={'importance': 'Importancia (% de Varianza Explicada)', 'variable': 'Variable'},
         color='importance',
-        color_continuous_scale='Reds',
-        text=df['importance'].apply(lambda x: f'{x:.1%}')
+        color_continuous_scale='Reds'
     )
-    fig.update_traces(textposition='outside')
-    fig.update_layout(height=400, showlegend=False, xaxis_title="Importancia (%)", yaxis_title="", font=dict(size=14))
+    # Formato en el cliente: sin lambda por fila del lado Python
+    fig.update_traces(texttemplate='%{x:.1%}', textposition='outside')
+    fig.update_layout(height=400, showlegend=False, xaxis_title="Importancia (%)", yaxis_title="", yaxis_autorange='reversed', font=dict(size=14))
     return fig
 
-def render_distribution_chart(results: pd.DataFrame, stats: Dict):
+def render_distribution_chart(outcome_np: np.ndarray, stats: Dict):
+    # Solo el array y una tupla congelada de stats llegan al hasher de Streamlit
+    return _distribution_figure(outcome_np, tuple(sorted(stats.items())))
+
+@st.cache_data(show_spinner=False)
+def _distribution_figure(outcome: np.ndarray, stats_items: tuple):
+    """Binning del lado servidor: solo viajan al navegador los 50 conteos, no los N outcomes."""
+    stats = dict(stats_items)
+    counts, edges = np.histogram(outcome, bins=50)
     fig = go.Figure()
-    fig.add_trace(go.Histogram(x=results['outcome'], nbinsx=50, name='Distribución', marker_color='lightblue', opacity=0.7))
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+        name='Distribución', marker_color='lightblue', opacity=0.7
+    ))
     fig.add_vline(x=stats['p50'], line_dash="dash", line_color="blue", annotation_text=f"P50: ${stats['p50']:,.0f}")
     fig.add_vline(x=stats['p10'], line_dash="dash", line_color="red", annotation_text=f"P10: ${stats['p10']:,.0f}")
     fig.add_vline(x=stats['p90'], line_dash="dash", line_color="green", annotation_text=f"P90: ${stats['p90']:,.0f}")
-    fig.add_vrect(
-        x0=results['outcome'].min(), x1=0,
-        fillcolor="red", opacity=0.1, layer="below", line_width=0,
-        annotation_text="Zona de Pérdida", annotation_position="top left"
-    )
-    fig.update_layout(title='Distribución de Resultados (10,000 Simulaciones)', xaxis_title='Resultado (MXN)', yaxis_title='Frecuencia', height=400, showlegend=False)
+    # Zona de pérdida solo si algún escenario es negativo (edges[0] == outcome.min())
+    if edges[0] < 0:
+        fig.add_vrect(
+            x0=edges[0], x1=0,
+            fillcolor="red", opacity=0.1, layer="below", line_width=0,
+            annotation_text="Zona de Pérdida", annotation_position="top left"
+        )
+    fig.update_layout(title='Distribución de Resultados (10,000 Simulaciones)', xaxis_title='Resultado (MXN)', yaxis_title='Frecuencia', height=400, showlegend=False, bargap=0, uirevision='dist')
     return fig
 
 # ═══════════════════════════════════════════════════════════════
@@ -242,19 +293,29 @@ def login_page():
 # VISTAS (EJECUTIVO / CONSULTOR)
 # ═══════════════════════════════════════════════════════════════
 
-def vista_ejecutivo(stats: Dict, triggers: List[Dict], results: pd.DataFrame, config):
-    st.markdown(f"<h2 style='color: #1f77b4;'>📊 Dashboard Ejecutivo - {config.get('client.name', 'Cliente')}</h2>", unsafe_allow_html=True)
-    st.markdown("---")
-    
+# Nivel de trigger → (componente de Streamlit, emoji); el resto cae en st.info
+_LEVEL_CALL = {
+    'CRÍTICO': (st.error, "🔴"),
+    'ALTO': (st.warning, "🟡"),
+}
+
+def render_kpi_row(stats: Dict, config, var_title: str = "VaR 95%"):
+    """Fila de 3 gauges compartida por las vistas Ejecutivo y Consultor (cada una con su título de VaR)."""
     st.subheader("📈 Indicadores Clave de Riesgo")
     col1, col2, col3 = st.columns(3)
     with col1:
         threshold_loss = config.get('thresholds.critical_loss_prob', 0.25)
         st.plotly_chart(render_gauge(stats['prob_loss'], "Probabilidad de Pérdida", 1.0, threshold_loss), use_container_width=True)
     with col2:
-        st.plotly_chart(render_gauge(abs(stats['var_95']), "VaR 95% (Pérdida Máxima)", abs(stats['var_95']) * 2, abs(stats['var_95']) * 0.8), use_container_width=True)
+        st.plotly_chart(render_gauge(abs(stats['var_95']), var_title, abs(stats['var_95']) * 2, abs(stats['var_95']) * 0.8), use_container_width=True)
     with col3:
         st.plotly_chart(render_gauge(stats['p50'], "Resultado Esperado (P50)", stats['p90'], stats['mean'] * 0.5), use_container_width=True)
+
+def vista_ejecutivo(stats: Dict, triggers: List[Dict], results: pd.DataFrame, config):
+    st.markdown(f"<h2 style='color: #1f77b4;'>📊 Dashboard Ejecutivo - {config.get('client.name', 'Cliente')}</h2>", unsafe_allow_html=True)
+    st.markdown("---")
+    
+    render_kpi_row(stats, config, "VaR 95% (Pérdida Máxima)")
     
     st.markdown("---")
     st.subheader("💰 Resumen de Exposición Financiera")
@@ -271,16 +332,15 @@ def vista_ejecutivo(stats: Dict, triggers: List[Dict], results: pd.DataFrame, co
     if triggers:
         for trigger in triggers:
             nivel = trigger.get('nivel', 'INFO')
-            if nivel == 'CRÍTICO': st.error(f"🔴 **{nivel}**: {trigger.get('mensaje', '')}")
-            elif nivel == 'ALTO': st.warning(f"🟡 **{nivel}**: {trigger.get('mensaje', '')}")
-            else: st.info(f"🟠 **{nivel}**: {trigger.get('mensaje', '')}")
+            emit, emoji = _LEVEL_CALL.get(nivel, (st.info, "🟠"))
+            emit(f"{emoji} **{nivel}**: {trigger.get('mensaje', '')}")
         st.info("💡 **Nota**: Para un análisis detallado, contacte a su consultor de Evangelista & Co.")
     else:
         st.success("✅ No hay alertas activas. Todos los indicadores dentro de parámetros normales.")
         
     st.markdown("---")
     st.subheader("📊 Distribución de Resultados")
-    st.plotly_chart(render_distribution_chart(results, stats), use_container_width=True)
+    st.plotly_chart(render_distribution_chart(results['outcome'].to_numpy(), stats), use_container_width=True)
 
 def vista_consultor(stats: Dict, triggers: List[Dict], sensitivity: pd.DataFrame, results: pd.DataFrame, config, business_narrative: str, recommendations: List[Dict]):
     st.markdown(f"""
@@ -289,41 +349,43 @@ def vista_consultor(stats: Dict, triggers: List[Dict], sensitivity: pd.DataFrame
     """, unsafe_allow_html=True)
     st.markdown("---")
     
-    st.subheader("📈 Indicadores Clave de Riesgo")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        threshold_loss = config.get('thresholds.critical_loss_prob', 0.25)
-        st.plotly_chart(render_gauge(stats['prob_loss'], "Probabilidad de Pérdida", 1.0, threshold_loss), use_container_width=True)
-    with col2:
-        st.plotly_chart(render_gauge(abs(stats['var_95']), "VaR 95%", abs(stats['var_95']) * 2, abs(stats['var_95']) * 0.8), use_container_width=True)
-    with col3:
-        st.plotly_chart(render_gauge(stats['p50'], "Resultado Esperado (P50)", stats['p90'], stats['mean'] * 0.5), use_container_width=True)
-    
+    # st.tabs ejecuta el cuerpo de todas las pestañas; el radio solo construye la sección activa
+    seccion = st.radio(
+        "Sección",
+        ["📈 KPIs", "📝 Traducción", "🎯 Sensibilidad", "⚡ Decisiones", "📊 Distribución"],
+        horizontal=True,
+        label_visibility="collapsed",
+    )
     st.markdown("---")
-    st.subheader("📝 Traducción Ejecutiva (Fase 3)")
-    if isinstance(business_narrative, dict):
-        st.info(business_narrative.get('confidence_level', ''))
-        st.markdown(business_narrative.get('executive_summary', ''))
     
-    st.markdown("---")
-    st.subheader("🎯 Análisis de Sensibilidad - Diagnóstico Raíz")
-    st.plotly_chart(render_tornado_chart(sensitivity), use_container_width=True)
+    if seccion == "📈 KPIs":
+        render_kpi_row(stats, config)
     
-    st.markdown("---")
-    st.subheader("⚡ Inteligencia de Decisiones (Fase 4)")
-    if recommendations:
-        for idx, rec in enumerate(recommendations, 1):
-            with st.expander(f"Estrategia #{idx}: {rec['title']} (Prioridad: {rec['priority']})", expanded=(rec['priority']==1)):
-                st.markdown(f"**Descripción:** {rec['description']}")
-                st.markdown("**Acciones Inmediatas:**")
-                for act in rec['actions']:
-                    st.write(f"- Paso {act['step']}: {act['action']} *(Responsable: {act['responsible']})*")
-    else:
-        st.success("✅ No hay recomendaciones de mitigación críticas por el momento.")
+    elif seccion == "📝 Traducción":
+        st.subheader("📝 Traducción Ejecutiva (Fase 3)")
+        if isinstance(business_narrative, dict):
+            st.info(business_narrative.get('confidence_level', ''))
+            st.markdown(business_narrative.get('executive_summary', ''))
     
-    st.markdown("---")
-    st.subheader("📊 Distribución de Resultados")
-    st.plotly_chart(render_distribution_chart(results, stats), use_container_width=True)
+    elif seccion == "🎯 Sensibilidad":
+        st.subheader("🎯 Análisis de Sensibilidad - Diagnóstico Raíz")
+        st.plotly_chart(render_tornado_chart(sensitivity), use_container_width=True)
+    
+    elif seccion == "⚡ Decisiones":
+        st.subheader("⚡ Inteligencia de Decisiones (Fase 4)")
+        if recommendations:
+            for idx, rec in enumerate(recommendations, 1):
+                with st.expander(f"Estrategia #{idx}: {rec['title']} (Prioridad: {rec['priority']})", expanded=(rec['priority']==1)):
+                    st.markdown(f"**Descripción:** {rec['description']}")
+                    st.markdown("**Acciones Inmediatas:**")
+                    for act in rec['actions']:
+                        st.write(f"- Paso {act['step']}: {act['action']} *(Responsable: {act['responsible']})*")
+        else:
+            st.success("✅ No hay recomendaciones de mitigación críticas por el momento.")
+    
+    else:
+        st.subheader("📊 Distribución de Resultados")
+        st.plotly_chart(render_distribution_chart(results['outcome'].to_numpy(), stats), use_container_width=True)
 
 # ═══════════════════════════════════════════════════════════════
 # EXPORTACIÓN DE REPORTES
@@ -850,7 +912,7 @@ KPI de gestión prioritario para el cliente.
             """)
         stats       = pipeline_results.get('statistics', {})
         sensitivity = pipeline_results.get('sensitivity', pd.DataFrame())
-        results_df  = pipeline_results.get('simulation_results', pd.DataFrame())
+        outcome_np  = pipeline_results.get('outcome_np')
         narrative   = pipeline_results.get('business_narrative', {})
         recs        = pipeline_results.get('recommendations', [])
 
@@ -873,9 +935,9 @@ KPI de gestión prioritario para el cliente.
             st.markdown("---")
             st.plotly_chart(render_tornado_chart(sensitivity), use_container_width=True)
 
-        if results_df is not None and not (isinstance(results_df, pd.DataFrame) and results_df.empty):
+        if outcome_np is not None and outcome_np.size:
             st.markdown("---")
-            st.plotly_chart(render_distribution_chart(results_df, stats), use_container_width=True)
+            st.plotly_chart(render_distribution_chart(outcome_np, stats), use_container_width=True)
 
         if recs:
             st.markdown("---")
@@ -930,10 +992,10 @@ def vista_ejecutivo_v2(pipeline_results: dict, config):
                 st.metric(f"Mes {mes}", s.get('emoji', '🟢'), s.get('estado', 'OK'))
 
     # Distribución
-    results_df = pipeline_results.get('simulation_results')
-    if results_df is not None and stats:
+    outcome_np = pipeline_results.get('outcome_np')
+    if outcome_np is not None and stats:
         st.markdown("---")
-        st.plotly_chart(render_distribution_chart(results_df, stats), use_container_width=True)
+        st.plotly_chart(render_distribution_chart(outcome_np, stats), use_container_width=True)
 
     # Exportar PDF (solo PDF para ejecutivo)
     st.markdown("---")
@@ -1007,11 +1069,11 @@ def vista_cliente(pipeline_results: dict, config):
             st.info("El semáforo estará disponible una vez que el consultor complete el análisis.")
 
         # Distribución de resultados (simplificada)
-        results_df = pipeline_results.get('simulation_results')
-        if results_df is not None and stats:
+        outcome_np = pipeline_results.get('outcome_np')
+        if outcome_np is not None and stats:
             st.markdown("---")
             st.subheader("📊 Distribución de Resultados")
-            st.plotly_chart(render_distribution_chart(results_df, stats), use_container_width=True)
+            st.plotly_chart(render_distribution_chart(outcome_np, stats), use_container_width=True)
 
     # ── Tab 2: Reportes ───────────────────────────────────────────────────────
     with tab_rep:
@@ -1029,23 +1091,6 @@ def vista_cliente(pipeline_results: dict, config):
 # ═══════════════════════════════════════════════════════════════
 
 def main():
-    st.markdown("""
-        <style>
-            [data-testid="stSidebarNav"] {display: none !important;}
-            .stButton>button { border: 1px solid #D4AF37; background-color: transparent; }
-            .stButton>button:hover { border: 1px solid #1A1A2E; color: #1A1A2E; }
-            [data-testid="stSidebar"] p, [data-testid="stSidebar"] span, 
-            [data-testid="stSidebar"] label, [data-testid="stSidebar"] h3, 
-            [data-testid="stSidebar"] strong { color: #FFFFFF !important; }
-            div[data-baseweb="base-input"], div[data-baseweb="select"] > div {
-                background-color: #FFFFFF !important; border: 1px solid #D4AF37 !important; border-radius: 4px;
-            }
-            div[data-baseweb="base-input"] input, div[data-baseweb="select"] div {
-                color: #1A1A2E !important; -webkit-text-fill-color: #1A1A2E !important;
-            }
-        </style>
-    """, unsafe_allow_html=True)
-    
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
     if 'role' not in st.session_state:
@@ -6,8 +6,24 @@ Versión: 1.0
 
 import yaml
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 
+# Parser en C (libyaml) si está disponible; mismo comportamiento que safe_load
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=32)
+def _parse_yaml(filepath: str, mtime: float) -> dict:
+    """
+    Parsea un YAML una sola vez por (ruta, mtime) durante la vida del proceso
+    
+    El dict retornado se comparte entre instancias: tratarlo como solo lectura.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_Loader)
+
 
 class ConfigurationManager:
     """
@@ -28,12 +44,21 @@ class ConfigurationManager:
         self.template_path = template
         self.client_config_path = client_config
         
-        # Cargar archivos
-        self.template = self._load_yaml(template)
-        self.client = self._load_yaml(client_config)
+        # Cargar archivos (lecturas independientes, en paralelo)
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            future_template = ex.submit(self._load_yaml, template)
+            future_client = ex.submit(self._load_yaml, client_config)
+            self.template = future_template.result()
+            self.client = future_client.result()
         
         # Merge (cliente override template)
         self.config = self._merge_configs(self.template, self.client)
+        
+        # Índice plano {'a.b.c': valor}: self.config no se modifica después de __init__
+        self._flat = self._flatten(self.config)
+        
+        # Resultado de validate(), calculado una sola vez
+        self._validation: Optional[Tuple[bool, List[str]]] = None
     
     def _load_yaml(self, filepath: str) -> dict:
         """
@@ -53,17 +78,19 @@ class ConfigurationManager:
             raise FileNotFoundError(f"❌ Archivo no encontrado: {filepath}")
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = yaml.safe_load(f)
-                if content is None:
-                    raise ValueError(f"❌ Archivo YAML vacío: {filepath}")
-                return content
+            content = _parse_yaml(filepath, os.path.getmtime(filepath))
+            if content is None:
+                raise ValueError(f"❌ Archivo YAML vacío: {filepath}")
+            return content
         except yaml.YAMLError as e:
             raise yaml.YAMLError(f"❌ Error al parsear YAML en {filepath}: {e}")
     
     def _merge_configs(self, template: dict, client: dict) -> dict:
         """
-        Merge recursivo: cliente override template
+        Merge profundo iterativo: cliente override template
+        
+        Solo copia los sub-dicts que el cliente sobreescribe; el resto
+        se comparte con el template.
         
         Args:
             template: Dict del template
@@ -77,15 +104,19 @@ class ConfigurationManager:
             Client:   {'b': {'c': 3, 'd': 4}}
             Result:   {'a': 1, 'b': {'c': 3, 'd': 4}}
         """
-        result = template.copy()
+        result = dict(template)
+        stack = [(result, client)]
         
-        for key, value in client.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                # Merge recursivo para dicts
-                result[key] = self._merge_configs(result[key], value)
-            else:
-                # Override directo
-                result[key] = value
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                    # Copiar solo el sub-dict que se va a modificar
+                    dst[key] = dict(dst[key])
+                    stack.append((dst[key], value))
+                else:
+                    # Override directo
+                    dst[key] = value
         
         return result
     
@@ -107,18 +138,28 @@ class ConfigurationManager:
             config.get('business_parameters.receta.harina')
             # >>> 0.5
         """
-        keys = path.split('.')
-        value = self.config
+        return self._flat.get(path, default)
+    
+    @staticmethod
+    def _flatten(config: dict) -> Dict[str, Any]:
+        """
+        Indexa todas las rutas dot notation del config (nodos intermedios incluidos)
         
-        try:
-            for key in keys:
+        Ejemplo:
+            {'a': {'b': 1}}  ->  {'a': {'b': 1}, 'a.b': 1}
+        """
+        flat = {}
+        stack = [('', config)]
+        
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                path = f"{prefix}.{key}" if prefix else str(key)
+                flat[path] = value
                 if isinstance(value, dict):
-                    value = value[key]
-                else:
-                    return default
-            return value
-        except (KeyError, TypeError):
-            return default
+                    stack.append((path, value))
+        
+        return flat
     
     def get_variables(self) -> List[Dict]:
         """
@@ -175,28 +216,39 @@ class ConfigurationManager:
             f"❌ No se encontró configuración de distribución para variable: {variable_name}"
         )
     
-    def validate(self) -> tuple[bool, list[str]]:
+    def validate(self, fast_fail: bool = False) -> tuple[bool, list[str]]:
         """
         Validador Universal Agnostico: 
         Solo exige la estructura maestra, no le importa la industria.
+        
+        Args:
+            fast_fail: Retorna en cuanto encuentra el primer error
         """
-        errors = []
+        if self._validation is not None:
+            is_valid, errors = self._validation
+            return is_valid, list(errors)
         
         # 1. Validaciones estructurales mínimas
-        if not self.get('client.id'):
-            errors.append("Falta identificador del cliente (client.id)")
-            
-        if not self.get('simulation.iterations'):
-            errors.append("Falta número de iteraciones (simulation.iterations)")
-            
-        if not self.get('variables'):
-            errors.append("No hay variables de riesgo definidas en el modelo.")
+        checks = [
+            ('client.id', "Falta identificador del cliente (client.id)"),
+            ('simulation.iterations', "Falta número de iteraciones (simulation.iterations)"),
+            ('variables', "No hay variables de riesgo definidas en el modelo."),
+        ]
+        
+        errors = []
+        for path, message in checks:
+            if not self.get(path):
+                errors.append(message)
+                if fast_fail:
+                    # Resultado parcial: no se cachea
+                    return False, errors
 
         # 2. Eliminamos las restricciones "legacy" de la pastelería.
         # Ya no exigimos 'precio_venta_unitario' ni 'receta'. 
         # El modelo de negocio ahora se dicta por la función matemática dinámica.
         
-        return len(errors) == 0, errors
+        self._validation = (len(errors) == 0, errors)
+        return self._validation[0], list(errors)
     
     def to_dict(self) -> dict:
         """
@@ -1,17 +1,45 @@
 from sqlalchemy import create_engine, text, inspect
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from sqlalchemy.sql.elements import TextClause
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+import asyncio
 import logging
+import os
+import re
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _typed_read_kwargs() -> Dict[str, str]:
+    """Columnas Arrow tipadas en read_sql si pyarrow está instalado (sin boxing a object)"""
+    try:
+        import pyarrow  # noqa: F401
+        return {'dtype_backend': 'pyarrow'}
+    except ImportError:
+        return {}
+
+
+@lru_cache(maxsize=None)
+def _import_adbc(engine: str):
+    """Módulo DBAPI de ADBC (transporte Arrow nativo) para el motor, o None si no está instalado"""
+    try:
+        if engine == 'postgresql':
+            import adbc_driver_postgresql.dbapi as dbapi
+            return dbapi
+    except ImportError:
+        pass
+    return None
+
+
 class DatabaseConnectionError(Exception):
     """Excepción para errores de conexión a base de datos"""
     pass
@@ -48,6 +76,10 @@ class DatabaseConnector:
                 value_column='costo_unitario',
                 filters={'insumo_id': 'HARINA_001'}
             )
+    
+    Thread-safe: una misma instancia puede compartirse entre hilos (p. ej. el
+    ThreadPoolExecutor de la carga histórica); el pool de SQLAlchemy reparte
+    conexiones y un lock protege el caché de statements.
     """
     
     # Connection strings por motor
@@ -57,6 +89,20 @@ class DatabaseConnector:
         'mysql': 'mysql+pymysql://{username}:{password}@{host}:{port}/{database}'
     }
     
+    # Drivers async (opcionales) para aquery_time_series
+    ASYNC_CONNECTION_TEMPLATES = {
+        'postgresql': 'postgresql+asyncpg://{username}:{password}@{host}:{port}/{database}',
+        'mysql': 'mysql+aiomysql://{username}:{password}@{host}:{port}/{database}'
+    }
+    
+    # URIs de ADBC (opcional) para leer resultados directamente en Arrow
+    ARROW_CONNECTION_TEMPLATES = {
+        'postgresql': 'postgresql://{username}:{password}@{host}:{port}/{database}'
+    }
+    
+    # Filas por bloque al leer con cursor del lado del servidor
+    STREAM_CHUNKSIZE = 100_000
+    
     def __init__(self,
                  engine: str,
                  host: str,
@@ -64,9 +110,10 @@ class DatabaseConnector:
                  username: str,
                  password: str,
                  port: Optional[int] = None,
-                 pool_size: int = 5,
-                 max_overflow: int = 10,
-                 pool_timeout: int = 30):
+                 pool_size: Optional[int] = None,
+                 max_overflow: Optional[int] = None,
+                 pool_timeout: int = 30,
+                 pool_recycle: Optional[int] = None):
         """
         Inicializa conector con connection pooling
         
@@ -77,9 +124,13 @@ class DatabaseConnector:
             username: Usuario con permisos de lectura
             password: Contraseña
             port: Puerto (usa defaults si None)
-            pool_size: Tamaño del connection pool
-            max_overflow: Conexiones adicionales permitidas
+            pool_size: Tamaño del connection pool (default: env DB_POOL_SIZE o 20)
+            max_overflow: Conexiones adicionales permitidas (default: env DB_MAX_OVERFLOW o 30)
             pool_timeout: Timeout en segundos
+            pool_recycle: Segundos antes de reciclar una conexión (default: env DB_POOL_RECYCLE o 1800)
+            
+            pool_size + max_overflow (por proceso, y otra vez para el engine
+            async) debe quedar por debajo de max_connections del servidor.
             
         Raises:
             ValueError: Si engine no es soportado
@@ -97,6 +148,12 @@ class DatabaseConnector:
         self.username = username
         self.port = port or self._get_default_port(engine)
         
+        # TextClause reutilizables por forma de consulta (tabla, columnas, filtros, orden)
+        self._statement_cache: Dict[tuple, TextClause] = {}
+        
+        # Protege el caché de statements cuando varios hilos comparten el conector
+        self._statement_lock = threading.Lock()
+        
         # Construir connection string
         connection_string = self.CONNECTION_TEMPLATES[engine].format(
             username=username,
@@ -106,14 +163,40 @@ class DatabaseConnector:
             database=database
         )
         
+        self._pool_kwargs = dict(
+            pool_size=pool_size if pool_size is not None else int(os.getenv('DB_POOL_SIZE', '20')),
+            max_overflow=max_overflow if max_overflow is not None else int(os.getenv('DB_MAX_OVERFLOW', '30')),
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle if pool_recycle is not None else int(os.getenv('DB_POOL_RECYCLE', '1800')),
+            pool_pre_ping=True  # Verifica conexiones antes de usar
+        )
+        
+        # Engine async: se crea al primer uso de aquery_time_series
+        async_template = self.ASYNC_CONNECTION_TEMPLATES.get(engine)
+        self._async_url = async_template.format(
+            username=username,
+            password=password,
+            host=host,
+            port=self.port,
+            database=database
+        ) if async_template else None
+        self._async_engine = None
+        
+        # Ruta Arrow (ADBC): solo si el driver está instalado
+        arrow_template = self.ARROW_CONNECTION_TEMPLATES.get(engine)
+        self._arrow_uri = arrow_template.format(
+            username=username,
+            password=password,
+            host=host,
+            port=self.port,
+            database=database
+        ) if arrow_template and _import_adbc(engine) else None
+        
         # Crear engine con pooling
         try:
             self.engine: Engine = create_engine(
                 connection_string,
-                pool_size=pool_size,
-                max_overflow=max_overflow,
-                pool_timeout=pool_timeout,
-                pool_pre_ping=True,  # Verifica conexiones antes de usar
+                **self._pool_kwargs,
                 echo=False  # Set True para debugging SQL
             )
             
@@ -146,6 +229,24 @@ class DatabaseConnector:
         }
         return defaults[engine]
     
+    @property
+    def async_engine(self):
+        """
+        AsyncEngine de SQLAlchemy, creado al primer uso
+        
+        Retorna None si el motor no tiene driver async o no está instalado
+        (asyncpg / aiomysql); en ese caso se usa la ruta síncrona.
+        """
+        if self._async_engine is None and self._async_url:
+            try:
+                from sqlalchemy.ext.asyncio import create_async_engine
+                self._async_engine = create_async_engine(self._async_url, **self._pool_kwargs)
+            except ImportError as e:
+                logger.warning(f"⚠️  Driver async no disponible ({e}). Usando ruta síncrona.")
+                self._async_url = None
+        
+        return self._async_engine
+    
     @contextmanager
     def get_connection(self):
         """
@@ -190,6 +291,180 @@ class DatabaseConnector:
         Raises:
             DatabaseQueryError: Si query falla
         """
+        statement, params = self._prepare_time_series(
+            table, date_column, value_column, filters, start_date, end_date, order_by
+        )
+        
+        logger.info(f"📊 Ejecutando query en {table}...")
+        
+        df = self._read_arrow(statement, params) if self._arrow_uri else None
+        if df is not None:
+            return self._finalize_time_series(df, filters, order_by)
+        
+        try:
+            # Cursor del lado del servidor: el resultado llega por bloques en vez de
+            # materializarse completo como objetos Python antes de crear el DataFrame
+            with self.engine.connect().execution_options(stream_results=True) as conn:
+                chunks = pd.read_sql(
+                    statement,
+                    conn,
+                    params=params,
+                    parse_dates=['fecha'],
+                    chunksize=self.STREAM_CHUNKSIZE,
+                    **_typed_read_kwargs()
+                )
+                df = pd.concat(chunks, ignore_index=True)
+            
+        except (SQLAlchemyError, pd.errors.DatabaseError) as e:
+            # pandas envuelve los errores de SQLAlchemy en su propio DatabaseError
+            raise DatabaseQueryError(
+                f"❌ Error ejecutando query en tabla '{table}':\n{str(e)}"
+            )
+        
+        return self._finalize_time_series(df, filters, order_by)
+    
+    async def aquery_time_series(self,
+                                 table: str,
+                                 date_column: str,
+                                 value_column: str,
+                                 filters: Optional[Dict[str, Any]] = None,
+                                 start_date: Optional[datetime] = None,
+                                 end_date: Optional[datetime] = None,
+                                 order_by: str = 'ASC') -> pd.DataFrame:
+        """
+        Variante async de query_time_series (mismos argumentos y retorno)
+        
+        Usa el engine async (asyncpg / aiomysql) para que varias series se
+        consulten concurrentemente con asyncio.gather. Si el motor no tiene
+        driver async disponible, ejecuta la versión síncrona en un hilo.
+        """
+        if self.async_engine is None:
+            return await asyncio.to_thread(
+                self.query_time_series,
+                table, date_column, value_column, filters, start_date, end_date, order_by
+            )
+        
+        statement, params = self._prepare_time_series(
+            table, date_column, value_column, filters, start_date, end_date, order_by
+        )
+        
+        logger.info(f"📊 Ejecutando query async en {table}...")
+        
+        try:
+            async with self.async_engine.connect() as conn:
+                result = await conn.execute(statement, params)
+                df = pd.DataFrame(result.fetchall(), columns=['fecha', 'valor'])
+            
+        except SQLAlchemyError as e:
+            raise DatabaseQueryError(
+                f"❌ Error ejecutando query en tabla '{table}':\n{str(e)}"
+            )
+        
+        df['fecha'] = pd.to_datetime(df['fecha'])
+        
+        return self._finalize_time_series(df, filters, order_by)
+    
+    def _read_arrow(self, statement: TextClause, params: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        Ejecuta la query por ADBC y convierte la tabla Arrow resultante a pandas
+        
+        Evita la conversión fila a fila del driver DBAPI. Retorna None si la
+        consulta falla por esta vía (p. ej. tipos de parámetros que el driver
+        no infiere), para que query_time_series reintente con SQLAlchemy.
+        """
+        dbapi = _import_adbc(self.engine_type)
+        
+        # ADBC usa parámetros posicionales ($1, $2, ...)
+        names: List[str] = []
+        
+        def positional(match: 're.Match') -> str:
+            names.append(match.group(1))
+            return f"${len(names)}"
+        
+        sql = re.sub(r':(\w+)', positional, statement.text)
+        
+        try:
+            with dbapi.connect(self._arrow_uri) as conn, conn.cursor() as cur:
+                cur.execute(sql, [params[name] for name in names])
+                arrow_table = cur.fetch_arrow_table()
+        
+        except dbapi.Error as e:
+            logger.warning(f"⚠️  Lectura Arrow falló ({e}). Reintentando vía SQLAlchemy.")
+            return None
+        
+        df = arrow_table.to_pandas(date_as_object=False)
+        df['fecha'] = pd.to_datetime(df['fecha'])
+        
+        return df
+    
+    def _prepare_time_series(self,
+                             table: str,
+                             date_column: str,
+                             value_column: str,
+                             filters: Optional[Dict[str, Any]],
+                             start_date: Optional[datetime],
+                             end_date: Optional[datetime],
+                             order_by: str) -> Tuple[TextClause, Dict[str, Any]]:
+        """Resuelve (statement, params) de una consulta de serie temporal"""
+        filter_cols = tuple(sorted(filters)) if filters else ()
+        
+        # Un TextClause por forma de consulta: misma SQL entre llamadas para que
+        # el caché de compilación de SQLAlchemy y el del driver acierten
+        shape = (
+            table, date_column, value_column, filter_cols,
+            bool(start_date), bool(end_date), order_by
+        )
+        
+        with self._statement_lock:
+            statement = self._statement_cache.get(shape)
+            
+            if statement is None:
+                statement = self._build_time_series_statement(*shape)
+                self._statement_cache[shape] = statement
+        
+        # Solo se re-enlazan los parámetros
+        params = {f"filter_{idx}": filters[col] for idx, col in enumerate(filter_cols)}
+        
+        if start_date:
+            params['start_date'] = start_date
+        
+        if end_date:
+            params['end_date'] = end_date
+        
+        return statement, params
+    
+    def _finalize_time_series(self,
+                              df: pd.DataFrame,
+                              filters: Optional[Dict[str, Any]],
+                              order_by: str) -> pd.DataFrame:
+        """Log y orden final del resultado de una serie temporal"""
+        if df.empty:
+            logger.warning(
+                f"⚠️  Query retornó 0 filas. "
+                f"Verifica filtros: {filters}"
+            )
+        else:
+            logger.info(
+                f"✅ Serie temporal extraída: {len(df)} registros "
+                f"({df['fecha'].min()} a {df['fecha'].max()})"
+            )
+        
+        # El ORDER BY ya se aplicó en SQL: solo se re-ordena si la verificación
+        # O(N) falla (p. ej. NULLs o collation inesperada), nunca por defecto
+        if order_by == 'ASC' and not df['fecha'].is_monotonic_increasing:
+            df = df.sort_values('fecha', ignore_index=True)
+        
+        return df
+    
+    def _build_time_series_statement(self,
+                                     table: str,
+                                     date_column: str,
+                                     value_column: str,
+                                     filter_cols: Tuple[str, ...],
+                                     has_start: bool,
+                                     has_end: bool,
+                                     order_by: str) -> TextClause:
+        """Construye (una vez por forma) la query parametrizada de query_time_series"""
         # Construir query parametrizada (previene SQL injection)
         query_parts = [
             f"SELECT {date_column} as fecha, {value_column} as valor",
@@ -197,61 +472,21 @@ class DatabaseConnector:
             "WHERE 1=1"
         ]
         
-        params = {}
-        
         # Agregar filtros
-        if filters:
-            for idx, (key, value) in enumerate(filters.items()):
-                param_name = f"filter_{idx}"
-                query_parts.append(f"AND {key} = :{param_name}")
-                params[param_name] = value
+        for idx, col in enumerate(filter_cols):
+            query_parts.append(f"AND {col} = :filter_{idx}")
         
         # Filtros de fecha
-        if start_date:
+        if has_start:
             query_parts.append(f"AND {date_column} >= :start_date")
-            params['start_date'] = start_date
         
-        if end_date:
+        if has_end:
             query_parts.append(f"AND {date_column} <= :end_date")
-            params['end_date'] = end_date
         
         # Ordenar
         query_parts.append(f"ORDER BY {date_column} {order_by}")
         
-        query = " ".join(query_parts)
-        
-        logger.info(f"📊 Ejecutando query en {table}...")
-        
-        try:
-            df = pd.read_sql(
-                text(query),
-                self.engine,
-                params=params
-            )
-            
-            if df.empty:
-                logger.warning(
-                    f"⚠️  Query retornó 0 filas. "
-                    f"Verifica filtros: {filters}"
-                )
-            else:
-                logger.info(
-                    f"✅ Serie temporal extraída: {len(df)} registros "
-                    f"({df['fecha'].min()} a {df['fecha'].max()})"
-                )
-            
-            # Convertir fecha a datetime si no lo es
-            df['fecha'] = pd.to_datetime(df['fecha'])
-            
-            # Ordenar por fecha (seguridad adicional)
-            df = df.sort_values('fecha').reset_index(drop=True)
-            
-            return df
-            
-        except SQLAlchemyError as e:
-            raise DatabaseQueryError(
-                f"❌ Error ejecutando query en tabla '{table}':\n{str(e)}"
-            )
+        return text(" ".join(query_parts))
     
     def list_tables(self, schema: Optional[str] = None) -> List[str]:
         """
@@ -316,6 +551,13 @@ class DatabaseConnector:
         self.engine.dispose()
         logger.info("🔒 Connection pool cerrado")
     
+    async def aclose(self):
+        """Cierra ambos connection pools (síncrono y async)"""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+        self.close()
+    
     def __repr__(self) -> str:
         """Representación string"""
         return (
@@ -3,6 +3,17 @@ import os
 from typing import List, Optional, Dict
 
 
+# ── Helpers de importación segura ─────────────────────────────────────────────
+
+def _excel_engine() -> Optional[str]:
+    """Usa python-calamine (lector en Rust) si está instalado; si no, el default de pandas"""
+    try:
+        import python_calamine  # noqa: F401
+        return 'calamine'
+    except ImportError:
+        return None
+
+
 class ExcelConnector:
     """
     Lector de archivos Excel con limpieza automática
@@ -30,7 +41,13 @@ class ExcelConnector:
             raise ValueError(f"❌ Archivo debe ser .xlsx o .xls: {file_path}")
         
         self.file_path = file_path
-        self.excel_file = pd.ExcelFile(file_path)
+        self._open()
+    
+    def _open(self):
+        """Abre el libro y reinicia el caché de hojas ligado a su mtime"""
+        self._mtime = os.path.getmtime(self.file_path)
+        self._sheet_cache: Dict[tuple, pd.DataFrame] = {}
+        self.excel_file = pd.ExcelFile(self.file_path, engine=_excel_engine())
     
     def list_sheets(self) -> List[str]:
         """
@@ -44,18 +61,28 @@ class ExcelConnector:
     def read_sheet(self,
                    sheet_name: str,
                    skip_rows: int = 0,
-                   header_row: int = 0) -> pd.DataFrame:
+                   header_row: int = 0,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Lee una hoja específica
         
+        El resultado se memoiza por (hoja, skip_rows, header_row, columns)
+        mientras el archivo no cambie de mtime; cada llamada recibe una copia
+        superficial.
+        
         Args:
             sheet_name: Nombre de la hoja
             skip_rows: Filas a saltear al inicio
             header_row: Fila donde están los headers (después de skip_rows)
+            columns: Solo leer estas columnas (None = todas)
             
         Returns:
             DataFrame limpio
         """
+        # Si el archivo cambió en disco, reabrir y descartar el caché
+        if os.path.getmtime(self.file_path) != self._mtime:
+            self._open()
+        
         if sheet_name not in self.list_sheets():
             available = ', '.join(self.list_sheets())
             raise ValueError(
@@ -63,18 +90,21 @@ class ExcelConnector:
                 f"Disponibles: {available}"
             )
         
-        # Leer hoja
-        df = pd.read_excel(
-            self.file_path,
-            sheet_name=sheet_name,
-            skiprows=skip_rows,
-            header=header_row
-        )
+        key = (sheet_name, skip_rows, header_row, tuple(columns) if columns else None)
         
-        # Limpiar
-        df = self.clean_dataframe(df)
+        if key not in self._sheet_cache:
+            # Leer hoja reutilizando el libro ya abierto
+            df = self.excel_file.parse(
+                sheet_name=sheet_name,
+                skiprows=skip_rows,
+                header=header_row,
+                usecols=columns
+            )
+            
+            # Limpiar
+            self._sheet_cache[key] = self.clean_dataframe(df)
         
-        return df
+        return self._sheet_cache[key].copy(deep=False)
     
     def read_all_sheets(self) -> Dict[str, pd.DataFrame]:
         """
@@ -105,58 +135,70 @@ class ExcelConnector:
         Returns:
             DataFrame limpio
         """
-        # Hacer copia para no modificar original
-        df = df.copy()
+        # Sin copia inicial: dropna ya retorna un DataFrame nuevo
         
         # 1. Eliminar filas completamente vacías
         df = df.dropna(how='all')
         
-        # 2. Eliminar columnas sin nombre
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-        
-        # 3. Eliminar columnas completamente vacías
-        df = df.dropna(axis=1, how='all')
-        
-        # 4. Strip espacios en strings
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].astype(str).str.strip()
+        # 2-3. Eliminar columnas sin nombre o completamente vacías (una sola selección)
+        has_data = df.notna().any().to_numpy()
+        keep = [
+            i for i, (col, filled) in enumerate(zip(df.columns, has_data))
+            if filled and not (isinstance(col, str) and col.startswith('Unnamed'))
+        ]
+        df = df.take(keep, axis=1)
+        
+        # 4. Strip espacios en strings (solo celdas str; NaN, horas, bools y mixtos se conservan)
+        str_cols = df.select_dtypes(include=['object', 'string']).columns
+        if len(str_cols):
+            df[str_cols] = df[str_cols].apply(
+                lambda s: s.map(lambda x: x.strip() if isinstance(x, str) else x)
+            )
         
-        # 5. Convertir columnas de fecha
-        for col in df.columns:
-            if 'fecha' in col.lower() or 'date' in col.lower():
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                except:
-                    pass
+        # 5. Convertir columnas de fecha en un solo paso
+        date_cols = [
+            col for col in df.columns
+            if isinstance(col, str) and ('fecha' in col.lower() or 'date' in col.lower())
+        ]
+        if date_cols:
+            try:
+                df[date_cols] = df[date_cols].apply(pd.to_datetime, errors='coerce')
+            except (TypeError, ValueError):
+                pass
         
         # 6. Reset index
         df = df.reset_index(drop=True)
         
         return df
     
-    def get_column_info(self, sheet_name: str) -> pd.DataFrame:
+    def get_column_info(self, sheet_name: str, include_stats: bool = True) -> pd.DataFrame:
         """
         Obtiene información sobre columnas de una hoja
         
         Args:
             sheet_name: Nombre de la hoja
+            include_stats: Si False, solo lee el encabezado (nrows=0) y retorna
+                los nombres de columna, sin tocar las filas
             
         Returns:
-            DataFrame con info: columna, tipo, valores_nulos
+            DataFrame con info: columna, tipo, valores_nulos, valores_unicos
         """
-        df = self.read_sheet(sheet_name)
+        if not include_stats:
+            header = self.excel_file.parse(sheet_name=sheet_name, nrows=0)
+            return pd.DataFrame({'columna': [
+                col for col in header.columns
+                if not (isinstance(col, str) and col.startswith('Unnamed'))
+            ]})
         
-        info = []
-        for col in df.columns:
-            info.append({
-                'columna': col,
-                'tipo': str(df[col].dtype),
-                'valores_nulos': df[col].isna().sum(),
-                'valores_unicos': df[col].nunique()
-            })
+        df = self.read_sheet(sheet_name)
         
-        return pd.DataFrame(info)
+        # Conteos en una pasada vectorizada por métrica
+        return pd.DataFrame({
+            'columna': df.columns,
+            'tipo': df.dtypes.astype(str).to_numpy(),
+            'valores_nulos': df.isna().sum().to_numpy(),
+            'valores_unicos': df.nunique().to_numpy()
+        })
     
     def __repr__(self) -> str:
         """Representación string"""
@@ -1,6 +1,19 @@
+import ast
+import asyncio
+import copy
+import hashlib
+import math
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Callable, Optional, Any
+from types import CodeType, ModuleType
+from typing import Dict, List, Callable, Optional, Any, Tuple
 from src.configuration_manager import ConfigurationManager
 from src.excel_connector import ExcelConnector
 from src.database_connector import DatabaseConnector, DatabaseConnectionError, DatabaseQueryError
@@ -9,6 +22,514 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# ── Helpers de importación segura ─────────────────────────────────────────────
+
+def _import_numba():
+    import numba
+    return numba
+
+
+def _import_cuda():
+    from numba import cuda
+    return cuda
+
+
+def _import_ndtr():
+    from scipy.special import ndtr
+    return ndtr
+
+
+def _norm_cdf(z: np.ndarray) -> np.ndarray:
+    """Φ(z) de la normal estándar (scipy si está instalado; si no, math.erfc por elemento)"""
+    try:
+        return _import_ndtr()(z)
+    except ImportError:
+        erfc = np.frompyfunc(math.erfc, 1, 1)
+        return 0.5 * erfc(-z / math.sqrt(2.0)).astype(np.float64)
+
+
+# Modelos de negocio compilados: hash del código -> (code, modelo_*, modelo_*_scalar)
+_MODEL_CACHE: Dict[str, Tuple[CodeType, Optional[str], Optional[str]]] = {}
+
+# Drivers Numba compilados por (hash del código del modelo, número de variables)
+_NUMBA_DRIVERS: Dict[tuple, Callable] = {}
+
+# Caché en disco (kernels Numba y series históricas en Parquet)
+_CACHE_ROOT = Path(os.getenv('EVANGELISTA_CACHE_DIR', Path.home() / '.cache' / 'evangelista'))
+
+
+def _compile_business_model(model_code: str) -> Tuple[CodeType, Optional[str], Optional[str], str]:
+    """
+    Compila el código del modelo una sola vez por contenido
+    
+    Returns:
+        (code, nombre de modelo_*, nombre de modelo_*_scalar, hash del código)
+    """
+    model_hash = hashlib.blake2b(model_code.encode()).hexdigest()
+    
+    if model_hash not in _MODEL_CACHE:
+        tree = ast.parse(model_code)
+        
+        # Nombres tomados del AST: sin ejecutar el código ni recorrer su namespace
+        # (primera función "modelo_*"; la variante "_scalar" es opcional)
+        names = [
+            node.name for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name.startswith('modelo_')
+        ]
+        model_name = next((n for n in names if not n.endswith('_scalar')), None)
+        scalar_name = next((n for n in names if n.endswith('_scalar')), None)
+        
+        code = compile(tree, f"<modelo-{model_hash[:8]}>", 'exec')
+        _MODEL_CACHE[model_hash] = (code, model_name, scalar_name)
+    
+    return (*_MODEL_CACHE[model_hash], model_hash)
+
+
+class _ScalarModelSpecializer(ast.NodeTransformer):
+    """
+    Evaluación parcial de `modelo_*(variables, config)` para un set fijo de variables
+    
+    - variables['x'] / variables.get('x', d)   -> v<j> (o d si x no existe)
+    - config['a']['b'] numérico                -> params[i]
+    - for k, v in config['a'].items(): ...     -> cuerpo desenrollado por clave
+      (salvo que el cuerpo reasigne k o v: el for queda y el modelo no se especializa)
+    - f-strings con partes constantes          -> constante
+    
+    Los valores numéricos no se pliegan en el fuente: quedan como argumento
+    `params` (en `param_values`), así el kernel depende solo de la estructura
+    de config y no se regenera cuando cambian los parámetros de negocio.
+    
+    Si tras la transformación sigue habiendo referencias a `variables` o
+    `config`, el modelo no es especializable.
+    """
+    
+    def __init__(self, variables_arg: str, config_arg: str, var_index: Dict[str, int], config: dict,
+                 params_arg: str = 'params'):
+        self.variables_arg = variables_arg
+        self.config_arg = config_arg
+        self.var_index = var_index
+        self.config = config
+        self.params_arg = params_arg
+        self.param_index: Dict[tuple, int] = {}
+        self.param_values: List[float] = []
+    
+    def _resolve_config(self, node: ast.AST) -> Tuple[Any, tuple]:
+        """(valor, ruta) de config[...][...] con claves constantes, o KeyError si no se resuelve"""
+        if isinstance(node, ast.Name) and node.id == self.config_arg:
+            return self.config, ()
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant):
+            value, path = self._resolve_config(node.value)
+            return value[node.slice.value], path + (node.slice.value,)
+        raise KeyError(ast.dump(node))
+    
+    def _param(self, path: tuple, value: Any, node: ast.AST) -> Optional[ast.Subscript]:
+        """`params[i]` para un valor numérico de config (una entrada por ruta), o None"""
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return None
+        if path not in self.param_index:
+            self.param_index[path] = len(self.param_values)
+            self.param_values.append(float(value))
+        ref = ast.Subscript(
+            ast.Name(self.params_arg, ast.Load()), ast.Constant(self.param_index[path]), ast.Load()
+        )
+        return ast.copy_location(ref, node)
+    
+    def _number(self, node: ast.AST) -> Optional[ast.Subscript]:
+        try:
+            value, path = self._resolve_config(node)
+        except (KeyError, IndexError, TypeError):
+            return None
+        return self._param(path, value, node)
+    
+    def visit_For(self, node: ast.For):
+        it = node.iter
+        is_items = (
+            isinstance(it, ast.Call) and isinstance(it.func, ast.Attribute)
+            and it.func.attr == 'items' and not it.args and not node.orelse
+            and isinstance(node.target, ast.Tuple) and len(node.target.elts) == 2
+            and all(isinstance(t, ast.Name) for t in node.target.elts)
+            and not any(isinstance(n, (ast.Break, ast.Continue)) for s in node.body for n in ast.walk(s))
+            and not _rebinds(node.body, {t.id for t in node.target.elts})
+        )
+        try:
+            mapping, path = self._resolve_config(it.func.value) if is_items else (None, ())
+        except (KeyError, IndexError, TypeError):
+            mapping = None
+        
+        if not isinstance(mapping, dict):
+            return self.generic_visit(node)
+        
+        # Las claves se pliegan (estructura); los valores numéricos pasan por params
+        key_name, value_name = (t.id for t in node.target.elts)
+        body = []
+        for key, value in mapping.items():
+            bindings = {
+                key_name: ast.Constant(key),
+                value_name: self._param(path + (key,), value, node) or ast.Constant(value),
+            }
+            for stmt in node.body:
+                stmt = _bind_names(copy.deepcopy(stmt), bindings)
+                visited = self.visit(stmt)
+                body.extend(visited if isinstance(visited, list) else [visited])
+        
+        return body or [ast.copy_location(ast.Pass(), node)]
+    
+    def visit_JoinedStr(self, node: ast.JoinedStr):
+        self.generic_visit(node)
+        parts = []
+        for part in node.values:
+            if isinstance(part, ast.FormattedValue):
+                if part.conversion != -1 or part.format_spec or not isinstance(part.value, ast.Constant):
+                    return node
+                part = part.value
+            if not isinstance(part, ast.Constant):
+                return node
+            parts.append(str(part.value))
+        return ast.copy_location(ast.Constant(''.join(parts)), node)
+    
+    def visit_Subscript(self, node: ast.Subscript):
+        self.generic_visit(node)
+        if (isinstance(node.value, ast.Name) and node.value.id == self.variables_arg
+                and isinstance(node.slice, ast.Constant) and node.slice.value in self.var_index):
+            return ast.copy_location(ast.Name(f"v{self.var_index[node.slice.value]}", ast.Load()), node)
+        return self._number(node) or node
+    
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+        func = node.func
+        if (isinstance(func, ast.Attribute) and func.attr == 'get' and isinstance(func.value, ast.Name)
+                and node.args and isinstance(node.args[0], ast.Constant) and not node.keywords):
+            key = node.args[0].value
+            default = node.args[1] if len(node.args) > 1 else None
+            
+            if func.value.id == self.variables_arg:
+                if key in self.var_index:
+                    return ast.copy_location(ast.Name(f"v{self.var_index[key]}", ast.Load()), node)
+                return default or node
+            
+            if func.value.id == self.config_arg:
+                ref = self._param((key,), self.config.get(key), node)
+                if ref is not None:
+                    return ref
+                return default if key not in self.config and default is not None else node
+        
+        return node
+
+
+def _rebinds(body: List[ast.stmt], names: set) -> bool:
+    """True si el cuerpo asigna, modifica (+=) o borra alguno de los nombres dados"""
+    return any(
+        isinstance(n, ast.Name) and n.id in names and isinstance(n.ctx, (ast.Store, ast.Del))
+        for stmt in body for n in ast.walk(stmt)
+    )
+
+
+def _bind_names(node: ast.AST, bindings: Dict[str, ast.expr]) -> ast.AST:
+    """Reemplaza lecturas de los nombres dados por expresiones fijas (variable de un for desenrollado)"""
+    for child in list(ast.walk(node)):
+        for field, value in ast.iter_fields(child):
+            if isinstance(value, ast.Name) and isinstance(value.ctx, ast.Load) and value.id in bindings:
+                setattr(child, field, ast.copy_location(copy.deepcopy(bindings[value.id]), value))
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, ast.Name) and isinstance(item.ctx, ast.Load) and item.id in bindings:
+                        value[i] = ast.copy_location(copy.deepcopy(bindings[item.id]), item)
+    return node
+
+
+def _specialize_scalar_model(model_code: str, model_name: str, var_names: List[str],
+                             business_params: Optional[dict]) -> Optional[Tuple[str, str, tuple]]:
+    """
+    Deriva `modelo_*_scalar(v0, ..., vK-1, params)` desde el modelo por diccionario
+    
+    Las variables pasan a argumentos posicionales y cada parámetro de negocio
+    numérico a una posición fija de la tupla `params`, así el kernel Numba no
+    hace ningún lookup de dict por simulación y su fuente (y su caché) no
+    cambia con los valores. Retorna (código, nombre, params) o None si el
+    modelo usa acceso dinámico que no se puede resolver en tiempo de setup.
+    """
+    tree = ast.parse(model_code)
+    func = next(
+        (n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name == model_name), None
+    )
+    if func is None or len(func.args.args) != 2:
+        return None
+    
+    variables_arg, config_arg = (a.arg for a in func.args.args)
+    params_arg = 'params' if 'params' not in (variables_arg, config_arg) else 'params_'
+    specializer = _ScalarModelSpecializer(
+        variables_arg, config_arg, {name: j for j, name in enumerate(var_names)}, business_params or {},
+        params_arg
+    )
+    
+    func = copy.deepcopy(func)
+    body = []
+    for stmt in func.body:
+        visited = specializer.visit(stmt)
+        body.extend(visited if isinstance(visited, list) else [visited])
+    func.body = body
+    
+    if any(isinstance(n, ast.Name) and n.id in (variables_arg, config_arg) for n in ast.walk(func)):
+        return None
+    
+    scalar_name = f"{model_name}_scalar"
+    func.name = scalar_name
+    func.decorator_list = []
+    func.args = ast.arguments(
+        posonlyargs=[], args=[ast.arg(f"v{j}") for j in range(len(var_names))] + [ast.arg(params_arg)],
+        kwonlyargs=[], kw_defaults=[], defaults=[]
+    )
+    
+    module = ast.fix_missing_locations(ast.Module(body=[func], type_ignores=[]))
+    return ast.unparse(module), scalar_name, tuple(specializer.param_values)
+
+
+def _compile_kernel_module(model_code: str, scalar_name: str, body: str, entry: str, jit_options: str) -> Callable:
+    """
+    Materializa un kernel generado como módulo .py (nombre = SHA1 del fuente)
+    
+    Con un archivo real, njit(cache=True) persiste el binario compilado entre
+    procesos y el warm-up de Numba se paga una sola vez. Si el directorio de
+    caché no es escribible, se compila en memoria sin caché.
+    
+    El archivo solo sirve de ancla para el caché de Numba: si su contenido no
+    coincide con el fuente generado (truncado o alterado) se reescribe, y lo
+    que se ejecuta es siempre el fuente en memoria, nunca lo leído del disco.
+    """
+    def render(cache: bool) -> str:
+        return "\n".join([
+            "# Kernel generado por UniversalMonteCarloEngine: no editar",
+            "import math",
+            "import numpy as np",
+            "from numba import njit, prange",
+            "",
+            model_code,
+            "",
+            f"model = njit(cache={cache})({scalar_name})",
+            "",
+            body,
+            f"{entry} = njit({jit_options}, cache={cache})({entry})",
+            "",
+        ])
+    
+    source = render(True)
+    digest = hashlib.sha1(source.encode()).hexdigest()
+    
+    try:
+        kernel_dir = _CACHE_ROOT / 'numba'
+        kernel_dir.mkdir(parents=True, exist_ok=True)
+        path = kernel_dir / f"kernel_{digest}.py"
+        
+        try:
+            on_disk = path.read_text(encoding='utf-8')
+        except (FileNotFoundError, UnicodeDecodeError):
+            on_disk = None
+        
+        if on_disk != source:
+            if on_disk is not None:
+                logger.warning(f"⚠️  Kernel en caché no coincide con su hash ({path.name}); se regenera.")
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(source, encoding='utf-8')
+            os.replace(tmp, path)
+        
+        # Registrado en sys.modules: Numba resuelve el módulo por nombre al cargar su caché;
+        # co_filename apunta al archivo para que Numba ubique (e invalide) su caché
+        name = f"_evangelista_kernel_{digest}"
+        module = ModuleType(name)
+        module.__file__ = str(path)
+        sys.modules[name] = module
+        exec(compile(source, str(path), 'exec'), module.__dict__)
+        return getattr(module, entry)
+    
+    except OSError as e:
+        logger.warning(f"Caché de kernels no disponible ({e}); se compila en memoria.")
+        namespace = {}
+        exec(render(False), namespace)
+        return namespace[entry]
+
+
+def _build_numba_driver(model_code: str, scalar_name: str, model_hash: str, n_vars: int) -> Callable:
+    """
+    Genera y compila un driver paralelo para un modelo `modelo_*_scalar`
+    
+    El driver evalúa:
+        for i in prange(n_sims):
+            out[i] = model(X[i, 0], ..., X[i, n_vars - 1], params)
+    
+    La compilación real ocurre en la primera llamada (JIT perezoso).
+    """
+    key = (model_hash, n_vars)
+    
+    if key not in _NUMBA_DRIVERS:
+        _import_numba()
+        args = ", ".join(f"X[i, {j}]" for j in range(n_vars))
+        body = (
+            "def _driver(X, params, out):\n"
+            "    for i in prange(X.shape[0]):\n"
+            f"        out[i] = model({args}, params)\n"
+        )
+        _NUMBA_DRIVERS[key] = _compile_kernel_module(
+            model_code, scalar_name, body, '_driver', 'parallel=True'
+        )
+    
+    return _NUMBA_DRIVERS[key]
+
+
+# Cuantiles de get_statistics (el primero es el umbral de VaR/CVaR al 95%)
+_STAT_QUANTILES = np.array([0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99])
+
+
+# Código por distribución para el layout empaquetado de parámetros (_params / _dist_codes)
+_DIST_CODES = {'normal': 0, 'triangular': 1, 'uniform': 2}
+
+# Muestreo escalar por distribución (sintaxis np.random soportada por Numba) y su media teórica;
+# los parámetros se leen de la fila j de `dist` (layout de _pack_params), no del fuente
+_FUSED_SAMPLERS = {
+    'normal': (lambda j: f"np.random.normal(dist[{j}, 0], dist[{j}, 1])",
+               lambda p: p['mean']),
+    'triangular': (lambda j: f"np.random.triangular(dist[{j}, 0], dist[{j}, 1], dist[{j}, 2])",
+                   lambda p: (p['min'] + p['mode'] + p['max']) / 3),
+    'uniform': (lambda j: f"np.random.uniform(dist[{j}, 0], dist[{j}, 1])",
+                lambda p: (p['min'] + p['max']) / 2),
+}
+
+
+def _expected_values(variables_config: List[dict]) -> np.ndarray:
+    """Media teórica de cada variable (centro de los momentos de los kernels fusionados)"""
+    return np.array([
+        _FUSED_SAMPLERS[v['distribution']][1]({k: float(x) for k, x in v['params'].items()})
+        for v in variables_config
+    ], dtype=np.float64)
+
+
+def _build_fused_kernel(model_code: str, scalar_name: str, model_hash: str, variables_config: List[dict]) -> Callable:
+    """
+    Genera un kernel que fusiona muestreo + modelo escalar por simulación
+    
+    Los samples viven solo en registros; a memoria se escriben `out[i]` y, por
+    bloque, los momentos centrados de cada variable (Σd, Σd², Σd·y con
+    d = v - E[v]) que sensitivity_analysis necesita:
+    
+        for c in prange(n_chunks):
+            np.random.seed(seeds[c])
+            for i in bloque c:
+                v0 = np.random.normal(dist[0, 0], dist[0, 1]); ...
+                y = model(v0, ..., params)
+                out[i] = y
+                d0 = v0 - means[0]
+                acc[c, 0] += d0; acc[c, 1] += d0 * d0; acc[c, 2] += d0 * y; ...
+    
+    `dist` (n_vars, 3) y `means` son argumentos: el kernel solo depende del
+    modelo y de los tipos de distribución, no de sus parámetros.
+    """
+    spec = tuple(v['distribution'] for v in variables_config)
+    key = ('fused', model_hash, spec)
+    
+    if key not in _NUMBA_DRIVERS:
+        _import_numba()
+        lines = [
+            "def _fused(n, n_chunks, seeds, dist, means, params, out, acc):",
+            "    chunk = (n + n_chunks - 1) // n_chunks",
+            "    for c in prange(n_chunks):",
+            "        np.random.seed(seeds[c])",
+            "        for i in range(c * chunk, min((c + 1) * chunk, n)):",
+        ]
+        for j, dist in enumerate(spec):
+            lines.append(f"            v{j} = {_FUSED_SAMPLERS[dist][0](j)}")
+        args = ", ".join(f"v{j}" for j in range(len(spec)))
+        lines += [f"            y = model({args}, params)", "            out[i] = y"]
+        for j in range(len(spec)):
+            lines += [
+                f"            d = v{j} - means[{j}]",
+                f"            acc[c, {3 * j}] += d",
+                f"            acc[c, {3 * j + 1}] += d * d",
+                f"            acc[c, {3 * j + 2}] += d * y",
+            ]
+        _NUMBA_DRIVERS[key] = _compile_kernel_module(
+            model_code, scalar_name, "\n".join(lines) + "\n", '_fused', 'parallel=True, fastmath=True'
+        )
+    
+    return _NUMBA_DRIVERS[key]
+
+
+# Muestreo por hilo CUDA (xoroshiro128p); la triangular va por CDF inversa
+_CUDA_SAMPLERS = {
+    'normal': lambda j: f"dist[{j}, 0] + dist[{j}, 1] * xoroshiro128p_normal_float64(states, tid)",
+    'triangular': lambda j: (
+        f"_triangular(xoroshiro128p_uniform_float64(states, tid), dist[{j}, 0], dist[{j}, 1], dist[{j}, 2])"
+    ),
+    'uniform': lambda j: (
+        f"dist[{j}, 0] + (dist[{j}, 1] - dist[{j}, 0]) * xoroshiro128p_uniform_float64(states, tid)"
+    ),
+}
+
+_CUDA_HEADER = """\
+import math
+from numba import cuda
+from numba.cuda.random import xoroshiro128p_normal_float64, xoroshiro128p_uniform_float64
+
+
+@cuda.jit(device=True)
+def _triangular(u, a, c, b):
+    if u < (c - a) / (b - a):
+        return a + math.sqrt(u * (b - a) * (c - a))
+    return b - math.sqrt((1.0 - u) * (b - a) * (b - c))
+"""
+
+
+def _build_cuda_kernel(model_code: str, scalar_name: str, model_hash: str, variables_config: List[dict]) -> Callable:
+    """
+    Variante CUDA del kernel fusionado: muestreo + modelo en el dispositivo
+    
+    Cada hilo recorre sus simulaciones con grid-stride, escribe `out[i]` y
+    deja sus momentos centrados en `acc[tid]` (mismo layout que el kernel
+    fusionado de CPU), así solo outcome y acc vuelven al host:
+    
+        for i in range(tid, n, gridsize):
+            v0 = dist[0, 0] + dist[0, 1] * xoroshiro128p_normal_float64(states, tid); ...
+            y = model(v0, ..., params)
+            out[i] = y
+            s0_0 += d0; s0_1 += d0 * d0; s0_2 += d0 * y; ...
+    
+    Como en el kernel fusionado, `dist` y `means` llegan como argumentos.
+    """
+    spec = tuple(v['distribution'] for v in variables_config)
+    key = ('cuda', model_hash, spec)
+    
+    if key not in _NUMBA_DRIVERS:
+        cuda = _import_cuda()
+        n_vars = len(spec)
+        
+        lines = [
+            "def _cuda_mc(n, states, dist, means, params, out, acc):",
+            "    tid = cuda.grid(1)",
+            "    if tid >= acc.shape[0]:",
+            "        return",
+        ]
+        lines += [f"    s{j}_{k} = 0.0" for j in range(n_vars) for k in range(3)]
+        lines.append("    for i in range(tid, n, cuda.gridsize(1)):")
+        for j, dist in enumerate(spec):
+            lines.append(f"        v{j} = {_CUDA_SAMPLERS[dist](j)}")
+        args = ", ".join(f"v{j}" for j in range(n_vars))
+        lines += [f"        y = model({args}, params)", "        out[i] = y"]
+        for j in range(n_vars):
+            lines += [
+                f"        d = v{j} - means[{j}]",
+                f"        s{j}_0 += d",
+                f"        s{j}_1 += d * d",
+                f"        s{j}_2 += d * y",
+            ]
+        lines += [f"    acc[tid, {3 * j + k}] = s{j}_{k}" for j in range(n_vars) for k in range(3)]
+        
+        namespace = {}
+        exec(_CUDA_HEADER + "\n" + model_code + "\n", namespace)
+        namespace['model'] = cuda.jit(device=True)(namespace[scalar_name])
+        exec("\n".join(lines) + "\n", namespace)
+        _NUMBA_DRIVERS[key] = cuda.jit(namespace['_cuda_mc'])
+    
+    return _NUMBA_DRIVERS[key]
+
+
 class UniversalMonteCarloEngine:
     """
     Motor de simulación Monte Carlo configurable
@@ -25,10 +546,27 @@ class UniversalMonteCarloEngine:
     def __init__(self, config: ConfigurationManager):
        
         self.config = config
-        self.historical_data = {}
+        self.historical_data: Dict[str, np.ndarray] = {}
         self.variables_config = []
         self.model_function = None
-        self.results = None
+        self.scalar_kernel = None
+        self.fused_kernel = None
+        self.cuda_kernel = None
+        self._kernel_params: tuple = ()
+        
+        # Parámetros empaquetados por variable: filas = variables, columnas según _pack_params
+        self._params: Optional[np.ndarray] = None
+        self._dist_codes: Optional[np.ndarray] = None
+        self._rng = None
+        self._corr_factor: Optional[np.ndarray] = None
+        self._corr_rows: Optional[np.ndarray] = None
+        
+        # Resultados en formato SoA; el DataFrame se materializa bajo demanda
+        self._samples: Optional[Dict[str, np.ndarray]] = None
+        self._outcomes: Optional[np.ndarray] = None
+        self._samples_matrix: Optional[np.ndarray] = None
+        self._fused_moments: Optional[np.ndarray] = None
+        self._results: Optional[pd.DataFrame] = None
         
         # Validar configuración
         is_valid, errors = config.validate()
@@ -46,124 +584,309 @@ class UniversalMonteCarloEngine:
         data_sources = self.config.get('data_sources', [])
         
         if not data_sources:
-            print("⚠️  No hay data_sources configuradas. Usando precios actuales.")
+            logger.warning("⚠️  No hay data_sources configuradas. Usando precios actuales.")
             return
         
+        loaders = []
         for source in data_sources:
             source_type = source.get('type')
             
             if source_type == 'database':
-                self._load_from_database(source)
+                loaders.append((self._load_from_database, source))
             
             elif source_type == 'excel':
                 logger.warning(
                     "⚠️  ExcelConnector está deprecado para producción. "
                     "Migrar a 'type: database' en configuración."
                 )
-                self._load_from_excel(source)
+                loaders.append((self._load_from_excel, source))
             
             else:
-                print(f"⚠️  Tipo de source no soportado: {source_type}")
+                logger.warning(f"⚠️  Tipo de source no soportado: {source_type}")
+        
+        # Las fuentes son independientes y limitadas por I/O (red/disco): se cargan en
+        # paralelo. Cada fuente debe mapear variables distintas.
+        start = time.perf_counter()
+        
+        if len(loaders) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(loaders))) as executor:
+                list(executor.map(lambda loader: loader[0](loader[1]), loaders))
+        else:
+            for load, source in loaders:
+                load(source)
+        
+        self._log_load_summary(time.perf_counter() - start)
 
-    def _load_from_database(self, source_config: dict):
+    async def aload_historical_data(self):
         """
-        Carga datos desde Data Mesh via DatabaseConnector
+        Variante async de load_historical_data
+        
+        Las tablas de todas las fuentes database se consultan concurrentemente
+        (asyncio.gather sobre DatabaseConnector.aquery_time_series); las fuentes
+        Excel se leen en un hilo.
         """
-        # Extraer credenciales de conexión
-        engine = source_config.get('engine', 'postgresql')
-        host = source_config.get('host')
-        port = source_config.get('port')
-        database = source_config.get('database')
-        username = source_config.get('username')
-        password = source_config.get('password')
+        data_sources = self.config.get('data_sources', [])
         
-        # Validar configuración mínima
-        required = ['host', 'database', 'username', 'password']
-        missing = [k for k in required if not source_config.get(k)]
+        if not data_sources:
+            logger.warning("⚠️  No hay data_sources configuradas. Usando precios actuales.")
+            return
         
-        if missing:
-            print(f"❌ Configuración incompleta en data_source. Faltan: {missing}")
+        tasks = []
+        for source in data_sources:
+            source_type = source.get('type')
+            
+            if source_type == 'database':
+                tasks.append(self._aload_from_database(source))
+            
+            elif source_type == 'excel':
+                logger.warning(
+                    "⚠️  ExcelConnector está deprecado para producción. "
+                    "Migrar a 'type: database' en configuración."
+                )
+                tasks.append(asyncio.to_thread(self._load_from_excel, source))
+            
+            else:
+                logger.warning(f"⚠️  Tipo de source no soportado: {source_type}")
+        
+        start = time.perf_counter()
+        await asyncio.gather(*tasks)
+        self._log_load_summary(time.perf_counter() - start)
+    
+    def _log_load_summary(self, elapsed: float):
+        """Un solo resumen de carga en vez de un mensaje por tabla/hoja"""
+        logger.info(
+            f"✅ Datos históricos cargados: {len(self.historical_data)} variables "
+            f"en {elapsed:.2f}s ({', '.join(self.historical_data) or 'ninguna'})"
+        )
+
+    def _load_from_database(self, source_config: dict):
+        """
+        Carga datos desde Data Mesh via DatabaseConnector
+        
+        Las series con copia vigente en el caché Parquet no se consultan; si
+        todas están en caché, ni siquiera se abre la conexión.
+        """
+        pending = self._pending_db_tables(source_config)
+        if not pending:
             return
         
         try:
-            # Inicializar conector
-            connector = DatabaseConnector(
-                engine=engine,
-                host=host,
-                database=database,
-                username=username,
-                password=password,
-                port=port
-            )
-            
-            # Validar conexión antes de queries
-            is_valid, message = connector.validate_connection()
-            if not is_valid:
-                print(f"❌ {message}")
+            connector = self._connect_database(source_config)
+            if connector is None:
                 return
             
-            # Iterar sobre tablas configuradas
-            tables_config = source_config.get('tables', [])
-            
-            for table_config in tables_config:
-                table = table_config.get('table')
-                date_column = table_config.get('date_column')
-                value_column = table_config.get('value_column')
-                variable_name = table_config.get('maps_to_variable')
-                filters = table_config.get('filters', {})
-                start_date = table_config.get('start_date')
-                end_date = table_config.get('end_date')
+            # Tablas consultadas en paralelo sobre el pool del conector: cada query
+            # espera en red con el GIL liberado por el driver
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                futures = {
+                    executor.submit(connector.query_time_series, **query): (variable_name, query, cache_path)
+                    for variable_name, query, cache_path in pending
+                }
                 
-                # Validar configuración de tabla
-                if not all([table, date_column, value_column, variable_name]):
-                    print(
-                        f"⚠️  Configuración incompleta en tabla. "
-                        f"Requiere: table, date_column, value_column, maps_to_variable"
-                    )
-                    continue
-                
-                try:
-                    # Extraer serie temporal
-                    df = connector.query_time_series(
-                        table=table,
-                        date_column=date_column,
-                        value_column=value_column,
-                        filters=filters,
-                        start_date=start_date,
-                        end_date=end_date
-                    )
-                    
-                    if df.empty:
-                        print(
-                            f"⚠️  No hay datos para {variable_name} en tabla {table}. "
-                            f"Filtros: {filters}"
-                        )
+                for future in as_completed(futures):
+                    variable_name, query, cache_path = futures[future]
+                    try:
+                        # Extraer serie temporal
+                        df = future.result()
+                        self._write_cached_series(cache_path, df)
+                        self._store_db_series(variable_name, query, df)
+                        
+                    except DatabaseQueryError as e:
+                        logger.error(f"❌ Error en query para {variable_name}: {e}")
                         continue
-                    
-                    # Guardar en historical_data
-                    self.historical_data[variable_name] = df[['fecha', 'valor']].copy()
-                    
-                    print(
-                        f"✅ Datos cargados desde DB: {variable_name} "
-                        f"({len(df)} registros de {table})"
-                    )
-                    
-                except DatabaseQueryError as e:
-                    print(f"❌ Error en query para {variable_name}: {e}")
-                    continue
             
             # Cerrar conexión
             connector.close()
             
         except DatabaseConnectionError as e:
-            print(f"❌ Error de conexión a Data Mesh: {e}")
-            print("💡 Verifica: credenciales, firewall, servicio de BD activo")
+            logger.error(f"❌ Error de conexión a Data Mesh: {e}")
+            logger.error("💡 Verifica: credenciales, firewall, servicio de BD activo")
+            return
+        
+        except Exception as e:
+            logger.error(f"❌ Error inesperado al cargar desde database: {e}")
+            return
+    
+    async def _aload_from_database(self, source_config: dict):
+        """Igual que _load_from_database, con todas las tablas consultadas en paralelo"""
+        pending = await asyncio.to_thread(self._pending_db_tables, source_config)
+        if not pending:
+            return
+        
+        try:
+            connector = await asyncio.to_thread(self._connect_database, source_config)
+            if connector is None:
+                return
+            
+            results = await asyncio.gather(
+                *(connector.aquery_time_series(**query) for _, query, _ in pending),
+                return_exceptions=True
+            )
+            
+            for (variable_name, query, cache_path), result in zip(pending, results):
+                if isinstance(result, DatabaseQueryError):
+                    logger.error(f"❌ Error en query para {variable_name}: {result}")
+                    continue
+                if isinstance(result, BaseException):
+                    raise result
+                self._write_cached_series(cache_path, result)
+                self._store_db_series(variable_name, query, result)
+            
+            # Cerrar conexión
+            await connector.aclose()
+            
+        except DatabaseConnectionError as e:
+            logger.error(f"❌ Error de conexión a Data Mesh: {e}")
+            logger.error("💡 Verifica: credenciales, firewall, servicio de BD activo")
             return
         
         except Exception as e:
-            print(f"❌ Error inesperado al cargar desde database: {e}")
+            logger.error(f"❌ Error inesperado al cargar desde database: {e}")
             return
     
+    def _pending_db_tables(self, source_config: dict) -> List[tuple]:
+        """
+        Sirve desde el caché Parquet las tablas vigentes de una fuente
+        
+        Returns:
+            Lista de (variable, kwargs de query_time_series, ruta de caché)
+            de las tablas que sí hay que consultar
+        """
+        pending = []
+        
+        for table_config in source_config.get('tables', []):
+            table_query = self._table_query(table_config)
+            if table_query is None:
+                continue
+            
+            variable_name, query = table_query
+            cache_path = self._series_cache_path(source_config, table_config)
+            
+            df = self._read_cached_series(cache_path)
+            if df is not None:
+                self._store_db_series(variable_name, query, df, origin='caché')
+                continue
+            
+            pending.append((variable_name, query, cache_path))
+        
+        return pending
+    
+    @staticmethod
+    def _series_cache_path(source_config: dict, table_config: dict) -> Path:
+        """Ruta Parquet de una serie: sha256 del origen (motor, host, base) y de la config de tabla"""
+        identity = {
+            'engine': source_config.get('engine', 'postgresql'),
+            'host': source_config.get('host'),
+            'port': source_config.get('port'),
+            'database': source_config.get('database'),
+            'table': table_config
+        }
+        key = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+        
+        return _CACHE_ROOT / 'historical' / f"{key}.parquet"
+    
+    def _read_cached_series(self, path: Path) -> Optional[pd.DataFrame]:
+        """Lee una serie del caché si existe y no superó cache.ttl_seconds (0 desactiva el caché)"""
+        ttl = self.config.get('cache.ttl_seconds', 3600)
+        if not ttl:
+            return None
+        
+        try:
+            if time.time() - path.stat().st_mtime > ttl:
+                return None
+            return pd.read_parquet(path)
+        
+        except FileNotFoundError:
+            return None
+        
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning(f"⚠️  Caché de series no disponible ({e}). Consultando BD.")
+            return None
+    
+    def _write_cached_series(self, path: Path, df: pd.DataFrame):
+        """Guarda una serie recién consultada en el caché Parquet (si está habilitado)"""
+        if df.empty or not self.config.get('cache.ttl_seconds', 3600):
+            return
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning(f"⚠️  No se pudo escribir el caché de series ({e}).")
+    
+    def _connect_database(self, source_config: dict) -> Optional[DatabaseConnector]:
+        """Crea y valida el DatabaseConnector de una fuente (None si la config no sirve)"""
+        # Validar configuración mínima
+        required = ['host', 'database', 'username', 'password']
+        missing = [k for k in required if not source_config.get(k)]
+        
+        if missing:
+            logger.error(f"❌ Configuración incompleta en data_source. Faltan: {missing}")
+            return None
+        
+        # Inicializar conector
+        connector = DatabaseConnector(
+            engine=source_config.get('engine', 'postgresql'),
+            host=source_config.get('host'),
+            database=source_config.get('database'),
+            username=source_config.get('username'),
+            password=source_config.get('password'),
+            port=source_config.get('port')
+        )
+        
+        # Validar conexión antes de queries
+        is_valid, message = connector.validate_connection()
+        if not is_valid:
+            logger.error(f"❌ {message}")
+            return None
+        
+        return connector
+    
+    @staticmethod
+    def _table_query(table_config: dict) -> Optional[tuple]:
+        """Traduce una entrada de `tables` a (variable, kwargs de query_time_series)"""
+        table = table_config.get('table')
+        date_column = table_config.get('date_column')
+        value_column = table_config.get('value_column')
+        variable_name = table_config.get('maps_to_variable')
+        
+        # Validar configuración de tabla
+        if not all([table, date_column, value_column, variable_name]):
+            logger.warning(
+                f"⚠️  Configuración incompleta en tabla. "
+                f"Requiere: table, date_column, value_column, maps_to_variable"
+            )
+            return None
+        
+        return variable_name, {
+            'table': table,
+            'date_column': date_column,
+            'value_column': value_column,
+            'filters': table_config.get('filters', {}),
+            'start_date': table_config.get('start_date'),
+            'end_date': table_config.get('end_date')
+        }
+    
+    def _store_db_series(self, variable_name: str, query: dict, df: pd.DataFrame, origin: str = 'DB'):
+        """Guarda una serie extraída de BD (o de su caché) en historical_data"""
+        if df.empty:
+            logger.warning(
+                f"⚠️  No hay datos para {variable_name} en tabla {query['table']}. "
+                f"Filtros: {query['filters']}"
+            )
+            return
+        
+        # Guardar en historical_data (solo los valores; las fechas no se usan aguas abajo)
+        self.historical_data[variable_name] = self._series_values(df['valor'])
+        
+        logger.debug(
+            f"✅ Datos cargados desde {origin}: {variable_name} "
+            f"({len(df)} registros de {query['table']})"
+        )
+    
     def _load_from_excel(self, source_config: dict):
         """Carga datos desde Excel"""
         path = source_config['path']
@@ -171,7 +894,7 @@ class UniversalMonteCarloEngine:
         try:
             connector = ExcelConnector(path)
         except FileNotFoundError:
-            print(f"⚠️  Archivo no encontrado: {path}. Continuando sin datos históricos.")
+            logger.warning(f"⚠️  Archivo no encontrado: {path}. Continuando sin datos históricos.")
             return
         
         sheets_config = source_config.get('sheets', [])
@@ -187,44 +910,45 @@ class UniversalMonteCarloEngine:
                 
                 # Validar columnas
                 if date_col not in df.columns:
-                    print(f"⚠️  Columna '{date_col}' no existe en hoja '{sheet_name}'")
+                    logger.warning(f"⚠️  Columna '{date_col}' no existe en hoja '{sheet_name}'")
                     continue
                 
                 if value_col not in df.columns:
-                    print(f"⚠️  Columna '{value_col}' no existe en hoja '{sheet_name}'")
+                    logger.warning(f"⚠️  Columna '{value_col}' no existe en hoja '{sheet_name}'")
                     continue
                 
                 # Guardar
-                self.historical_data[variable_name] = df[[date_col, value_col]].copy()
-                self.historical_data[variable_name].columns = ['fecha', 'valor']
+                self.historical_data[variable_name] = self._series_values(df[value_col])
                 
-                print(f"✅ Datos cargados: {variable_name} ({len(df)} filas)")
+                logger.debug(f"✅ Datos cargados: {variable_name} ({len(df)} filas)")
                 
             except Exception as e:
-                print(f"⚠️  Error al cargar hoja '{sheet_name}': {e}")
+                logger.warning(f"⚠️  Error al cargar hoja '{sheet_name}': {e}")
     
     def setup_simulation(self):
         """
         Configura variables y modelo de negocio
         """
-        print("\n📋 Configurando simulación...")
+        logger.info("📋 Configurando simulación...")
         
         # 1. Configurar variables
         variables = self.config.get_variables()
         
+        # Lecturas de config resueltas una sola vez, no por variable
+        dist_configs = {var['name']: self.config.get_distribution_config(var['name']) for var in variables}
+        current_prices = self.config.get('current_prices', {})
+        
         for var in variables:
             var_name = var['name']
-            
-            # Obtener configuración de distribución
-            dist_config = self.config.get_distribution_config(var_name)
+            dist_config = dist_configs[var_name]
             
             # Calcular parámetros
             if var_name in self.historical_data:
                 params = self._calculate_distribution_params(var_name, dist_config)
-                print(f"   ✅ {var_name}: {dist_config['type']} (desde datos históricos)")
+                logger.debug(f"   ✅ {var_name}: {dist_config['type']} (desde datos históricos)")
             else:
-                params = self._get_fallback_params(var_name, dist_config)
-                print(f"   ✅ {var_name}: {dist_config['type']} (fallback)")
+                params = self._get_fallback_params(var_name, dist_config, current_prices)
+                logger.debug(f"   ✅ {var_name}: {dist_config['type']} (fallback)")
             
             self.variables_config.append({
                 'name': var_name,
@@ -232,42 +956,235 @@ class UniversalMonteCarloEngine:
                 'params': params
             })
         
+        self._params, self._dist_codes = self._pack_params()
+        
+        # Factor de Cholesky de la cópula gaussiana para variables correlacionadas (opcional)
+        self._corr_factor, self._corr_rows = self._build_correlation_factor()
+        
         # 2. Cargar modelo de negocio
         model_code = self.config.get_business_model()
         
-        # Ejecutar código para definir función
-        namespace = {}
-        exec(model_code, namespace)
-        
-        # Buscar función que empiece con "modelo_"
-        for name, obj in namespace.items():
-            if name.startswith('modelo_') and callable(obj):
-                self.model_function = obj
-                print(f"   ✅ Modelo de negocio: {name}")
-                break
+        # Código compilado (y nombres de funciones) cacheados por hash del template
+        code, model_name, scalar_name, model_hash = _compile_business_model(model_code)
         
-        if not self.model_function:
+        if model_name is None:
             raise ValueError("❌ No se encontró función de modelo en template")
         
-        print("✅ Configuración completa\n")
+        # Ejecutar código para definir función (np y math ya disponibles para el modelo)
+        namespace = {'np': np, 'math': math}
+        exec(code, namespace)
+        
+        self.model_function = namespace[model_name]
+        logger.info(f"   ✅ Modelo de negocio: {model_name}")
+        
+        # Variante escrita a mano: recibe los parámetros numéricos de primer nivel
+        kernel_params = self._numeric_params(self.config.get('business_parameters'))
+        
+        # Sin variante escrita a mano: se intenta derivar del modelo por diccionario
+        if scalar_name is None:
+            specialized = _specialize_scalar_model(
+                model_code, model_name,
+                [v['name'] for v in self.variables_config],
+                self.config.get('business_parameters')
+            )
+            if specialized is not None:
+                model_code, scalar_name, kernel_params = specialized
+                model_hash = hashlib.blake2b(model_code.encode()).hexdigest()
+                logger.info(f"   ✅ Variante escalar derivada de {model_name}")
+        
+        # Variante escalar compatible con Numba: modelo_*_scalar(v0, ..., vK-1, params)
+        if scalar_name is not None:
+            self._kernel_params = kernel_params
+            try:
+                self.scalar_kernel = _build_numba_driver(
+                    model_code, scalar_name, model_hash, len(self.variables_config)
+                )
+                logger.info("   ✅ Variante escalar compilable con Numba detectada")
+                
+                # Kernel fusionado (opt-in): muestreo + modelo sin materializar samples
+                if self.config.get('simulation.fused_kernel', False):
+                    if self._corr_factor is not None:
+                        logger.warning("Kernel fusionado no soporta `correlations`; se muestrea por bloques.")
+                    else:
+                        self.fused_kernel = _build_fused_kernel(
+                            model_code, scalar_name, model_hash, self.variables_config
+                        )
+                
+                # Dispositivo CUDA (opt-in): mismo kernel fusionado, ejecutado en GPU
+                if self.config.get('simulation.device') == 'cuda':
+                    self.cuda_kernel = self._setup_cuda_kernel(model_code, scalar_name, model_hash)
+            except ImportError:
+                logger.warning("Numba no instalado; se usa evaluación por fila en Python.")
+        
+        n_hist = sum(v['name'] in self.historical_data for v in self.variables_config)
+        logger.info(
+            f"✅ Configuración completa: {len(self.variables_config)} variables "
+            f"({n_hist} desde datos históricos)"
+        )
+    
+    def _setup_cuda_kernel(self, model_code: str, scalar_name: str, model_hash: str) -> Optional[Callable]:
+        """Kernel CUDA si hay dispositivo y el modelo lo admite; None (ruta CPU) en otro caso"""
+        if self._corr_factor is not None:
+            logger.warning("Kernel CUDA no soporta `correlations`; se usa la ruta CPU.")
+            return None
+        
+        try:
+            cuda = _import_cuda()
+            if not cuda.is_available():
+                logger.warning("⚠️  simulation.device = 'cuda' pero no hay GPU disponible; se usa la ruta CPU.")
+                return None
+            
+            kernel = _build_cuda_kernel(model_code, scalar_name, model_hash, self.variables_config)
+        except Exception as e:
+            logger.warning(f"No se pudo preparar el kernel CUDA ({e}); se usa la ruta CPU.")
+            return None
+        
+        logger.info("   ✅ Kernel CUDA listo")
+        return kernel
+    
+    def _pack_params(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parámetros de variables_config como un array (n_vars, 3) float64 + códigos int8
+        
+        Columnas: normal (mean, std, nan), triangular (min, mode, max),
+        uniform (min, max, nan).
+        """
+        columns = {'normal': ('mean', 'std'), 'triangular': ('min', 'mode', 'max'), 'uniform': ('min', 'max')}
+        params = np.full((len(self.variables_config), 3), np.nan)
+        codes = np.empty(len(self.variables_config), dtype=np.int8)
+        
+        for j, var_config in enumerate(self.variables_config):
+            dist = var_config['distribution']
+            if dist not in _DIST_CODES:
+                raise ValueError(f"❌ Distribución no soportada: {dist}")
+            
+            codes[j] = _DIST_CODES[dist]
+            for k, name in enumerate(columns[dist]):
+                params[j, k] = var_config['params'][name]
+        
+        return params, codes
+    
+    @staticmethod
+    def _correlation_pairs(correlations: Any) -> Dict[Tuple[str, str], float]:
+        """
+        Normaliza `correlations` a {(var_a, var_b): rho}
+        
+        Acepta el formato anidado de los templates y la lista que genera el
+        agente de IA:
+            correlations:                 correlations:
+              precio_harina:                - var1: precio_harina
+                precio_azucar: 0.6            var2: precio_azucar
+                                              factor: 0.6
+        
+        Raises:
+            ValueError: Si alguna entrada está mal formada o rho no está en [-1, 1]
+        """
+        if isinstance(correlations, dict):
+            entries = []
+            for var_a, pairs in correlations.items():
+                if pairs is None:
+                    continue
+                if not isinstance(pairs, dict):
+                    raise ValueError(
+                        f"❌ correlations.{var_a} debe ser un mapeo {{variable: rho}}, no {pairs!r}"
+                    )
+                entries.extend((var_a, var_b, rho) for var_b, rho in pairs.items())
+        
+        elif isinstance(correlations, list):
+            entries = []
+            for item in correlations:
+                if not isinstance(item, dict) or not {'var1', 'var2', 'factor'} <= set(item):
+                    raise ValueError(
+                        f"❌ Entrada de correlations inválida (se espera var1, var2, factor): {item!r}"
+                    )
+                entries.append((item['var1'], item['var2'], item['factor']))
+        
+        else:
+            raise ValueError(
+                f"❌ correlations debe ser un mapeo o una lista, no {type(correlations).__name__}"
+            )
+        
+        pairs = {}
+        for var_a, var_b, rho in entries:
+            if not isinstance(var_a, str) or not isinstance(var_b, str) or var_a == var_b:
+                raise ValueError(f"❌ Par de correlación inválido: {var_a!r}~{var_b!r}")
+            if isinstance(rho, bool) or not isinstance(rho, (int, float)) or not -1 <= rho <= 1:
+                raise ValueError(f"❌ Correlación {var_a}~{var_b} debe ser un número en [-1, 1]: {rho!r}")
+            pairs[(var_a, var_b)] = float(rho)
+        
+        return pairs
+    
+    def _build_correlation_factor(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Construye L = cholesky(R) de una cópula gaussiana y las filas a las que aplica
+        
+        Pares simétricos (el resto se asume 0) en cualquiera de los formatos de
+        _correlation_pairs.
+        
+        R abarca todas las variables normales más las no normales que aparecen
+        en algún par, en el orden de variables_config. Las no normales se
+        muestrean como F⁻¹(Φ(z)) sobre la normal latente correlacionada, así
+        que rho es la correlación de las normales latentes (la de Pearson entre
+        marginales queda cerca, no igual).
+        
+        Returns:
+            (L, filas de variables_config cubiertas por R), o (None, None)
+        """
+        correlations = self.config.get('correlations')
+        if not correlations:
+            return None, None
+        
+        pairs = self._correlation_pairs(correlations)
+        names = [v['name'] for v in self.variables_config]
+        mentioned = {name for pair in pairs for name in pair}
+        
+        rows = np.array([
+            j for j, v in enumerate(self.variables_config)
+            if v['distribution'] == 'normal' or v['name'] in mentioned
+        ], dtype=np.intp)
+        index = {names[j]: k for k, j in enumerate(rows)}
+        R = np.eye(len(rows))
+        
+        for (var_a, var_b), rho in pairs.items():
+            if var_a not in index or var_b not in index:
+                logger.warning(
+                    f"⚠️  Correlación {var_a}~{var_b} ignorada: "
+                    f"variable no definida en el modelo"
+                )
+                continue
+            R[index[var_a], index[var_b]] = R[index[var_b], index[var_a]] = rho
+        
+        try:
+            L = np.linalg.cholesky(R)
+        except np.linalg.LinAlgError:
+            raise ValueError("❌ La matriz de correlaciones no es definida positiva")
+        
+        logger.info(f"   ✅ Correlaciones aplicadas entre {len(rows)} variables (cópula gaussiana)")
+        return L, rows
+    
+    @staticmethod
+    def _series_values(series: pd.Series) -> np.ndarray:
+        """Valores de una serie histórica como ndarray float64 contiguo, sin NaN"""
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return values[~np.isnan(values)]
     
     def _calculate_distribution_params(self, variable_name: str, dist_config: dict) -> dict:
         """Calcula parámetros desde datos históricos"""
-        df = self.historical_data[variable_name]
-        values = df['valor'].dropna()
+        # historical_data ya guarda ndarrays float64 sin NaN: las reducciones corren en NumPy
+        values = self.historical_data[variable_name]
         
         dist_type = dist_config['type']
         
         if dist_type == 'normal':
             return {
                 'mean': float(values.mean()),
-                'std': float(values.std())
+                'std': float(values.std(ddof=1))
             }
         
         elif dist_type == 'triangular':
             return {
                 'min': float(values.min()),
-                'mode': float(values.median()),
+                'mode': float(np.median(values)),  # selección O(n) vía partition, sin ordenar
                 'max': float(values.max())
             }
         
@@ -280,10 +1197,12 @@ class UniversalMonteCarloEngine:
         else:
             raise ValueError(f"❌ Distribución no soportada: {dist_type}")
     
-    def _get_fallback_params(self, variable_name: str, dist_config: dict) -> dict:
+    def _get_fallback_params(self, variable_name: str, dist_config: dict,
+                             current_prices: Optional[dict] = None) -> dict:
         """Obtiene parámetros de fallback"""
         fallback = dist_config.get('fallback', {})
-        current_prices = self.config.get('current_prices', {})
+        if current_prices is None:
+            current_prices = self.config.get('current_prices', {})
         current_value = current_prices.get(variable_name, 100)
         
         dist_type = dist_config['type']
@@ -311,117 +1230,347 @@ class UniversalMonteCarloEngine:
         """
         Ejecuta simulación Monte Carlo
         
+        Si el código del modelo define `modelo_x.__vectorized__ = True` (o la
+        config declara `business_model.vectorized: true`), el modelo se
+        llama una sola vez con {variable: ndarray} y debe usar solo operaciones
+        NumPy (sin if/comparaciones escalares); si falla con arrays, se cae a la
+        evaluación por fila. En otro caso se evalúa por fila:
+        con Numba si existe `modelo_*_scalar` y, con `simulation.fused_kernel: true`,
+        muestreo y modelo se fusionan sin materializar samples (results solo
+        contiene outcome). Con `simulation.device: cuda` ese mismo kernel corre
+        en GPU si hay un dispositivo disponible.
+        
         Returns:
             DataFrame con resultados
         """
         n_sims = self.config.get('simulation.n_simulations', 10000)
         seed = self.config.get('simulation.seed')
         
-        if seed:
-            np.random.seed(seed)
+        # El error Monte Carlo (~1/√N) supera de sobra el epsilon de float32
+        dtype = np.float32 if self.config.get('simulation.precision') in ('f32', 'fp32') else np.float64
         
-        print(f"🎲 Ejecutando {n_sims:,} simulaciones...\n")
+        # Generador único PCG64DXSM (mejor calidad estadística que MT19937 a gran escala)
+        rng = np.random.Generator(np.random.PCG64DXSM(seed))
+        self._rng = rng
         
-        # Generar samples para cada variable
+        logger.info(f"🎲 Ejecutando {n_sims:,} simulaciones...")
+        
+        # Ejecutar modelo
+        business_params = self.config.get('business_parameters')
+        
+        outcomes = None
         samples = {}
-        for var_config in self.variables_config:
-            name = var_config['name']
-            dist = var_config['distribution']
-            params = var_config['params']
-            
-            if dist == 'normal':
-                samples[name] = np.random.normal(
-                    params['mean'],
-                    params['std'],
-                    n_sims
-                )
+        self._samples_matrix = None
+        self._fused_moments = None
+        
+        if self.cuda_kernel is not None:
+            outcomes = self._run_cuda_kernel(rng, n_sims)
+        
+        if outcomes is None and self.fused_kernel is not None:
+            outcomes = self._run_fused_kernel(rng, n_sims)
+        
+        if outcomes is None:
+            samples = self._draw_samples(rng, n_sims, dtype)
             
-            elif dist == 'triangular':
-                samples[name] = np.random.triangular(
-                    params['min'],
-                    params['mode'],
-                    params['max'],
-                    n_sims
-                )
+            if self._model_is_vectorized():
+                # Una sola llamada con {variable: ndarray}: el modelo opera sobre arrays completos
+                try:
+                    outcomes = np.broadcast_to(
+                        np.asarray(self.model_function(samples, business_params), dtype=dtype),
+                        (n_sims,)
+                    )
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"El modelo no aceptó arrays ({e}); se evalúa por fila.")
             
-            elif dist == 'uniform':
-                samples[name] = np.random.uniform(
-                    params['min'],
-                    params['max'],
-                    n_sims
+            if outcomes is None and self.scalar_kernel is not None:
+                outcomes = self._run_scalar_kernel()
+        
+        if outcomes is None:
+            # Modelo escalar: una llamada por simulación sobre los arrays SoA,
+            # escribiendo en un buffer preasignado (sin lista de PyFloat)
+            names = list(samples)
+            outcomes = np.empty(n_sims, dtype=dtype)
+            for i, row in enumerate(zip(*(samples[n].tolist() for n in names))):
+                outcomes[i] = self.model_function(dict(zip(names, row)), business_params)
+        
+        self._samples = samples
+        self._outcomes = outcomes
+        self._results = None
+        
+        logger.info("✅ Simulación completada")
+        
+        return self.results
+    
+    @property
+    def results(self) -> Optional[pd.DataFrame]:
+        """DataFrame de resultados (samples + outcome), construido una sola vez al pedirlo"""
+        if self._results is None and self._outcomes is not None:
+            self._results = self.to_dataframe()
+        return self._results
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Materializa los arrays de la última simulación como DataFrame"""
+        if self._outcomes is None:
+            raise RuntimeError("❌ Debes ejecutar run() primero")
+        
+        df = pd.DataFrame(self._samples)
+        df['outcome'] = self._outcomes
+        
+        # El id de simulación es el RangeIndex (sin columna extra de n_sims * 8 bytes)
+        df.index.name = 'simulation_id'
+        return df
+    
+    def _model_is_vectorized(self) -> bool:
+        """El modelo acepta arrays si la función lleva `__vectorized__ = True` o la config lo declara"""
+        return bool(
+            self.config.get('business_model.vectorized', False)
+            or getattr(self.model_function, '__vectorized__', False)
+        )
+    
+    def _draw_samples(self, rng: np.random.Generator, n_sims: int, dtype=np.float64) -> Dict[str, np.ndarray]:
+        """
+        Genera {variable: ndarray(n_sims)} según variables_config
+        
+        Todas las variables comparten un buffer contiguo (n_vars, n_sims)
+        (`self._samples_matrix`); el dict solo contiene vistas de sus filas.
+        """
+        X = np.empty((len(self.variables_config), n_sims), dtype=dtype)
+        P, codes = self._params, self._dist_codes
+        
+        # Variables normales (y las correlacionadas de la cópula): normales estándar
+        # in-place, correlacionadas si hay `correlations`
+        normal_rows = np.flatnonzero(codes == _DIST_CODES['normal'])
+        corr_rows = self._corr_rows if self._corr_factor is not None else normal_rows
+        latent_rows = np.union1d(normal_rows, corr_rows)
+        for j in latent_rows:
+            rng.standard_normal(dtype=dtype, out=X[j])
+        
+        if corr_rows.size and self._corr_factor is not None:
+            # X = L·Z tiene covarianza L·Lᵀ = R (un solo matmul BLAS-3)
+            X[corr_rows] = self._corr_factor.astype(dtype, copy=False) @ X[corr_rows]
+        
+        for j in normal_rows:
+            X[j] *= dtype(P[j, 1])
+            X[j] += dtype(P[j, 0])
+        
+        # No normales correlacionadas: u = Φ(z) y la inversa de su CDF
+        for j in np.setdiff1d(latent_rows, normal_rows):
+            u = _norm_cdf(X[j].astype(np.float64))
+            if codes[j] == _DIST_CODES['triangular']:
+                a, c, b = P[j]
+                cut = (c - a) / (b - a)
+                X[j] = np.where(
+                    u < cut,
+                    a + np.sqrt(u * (b - a) * (c - a)),
+                    b - np.sqrt((1.0 - u) * (b - a) * (b - c))
                 )
+            else:
+                X[j] = P[j, 0] + u * (P[j, 1] - P[j, 0])
         
-        # Crear DataFrame
-        df_samples = pd.DataFrame(samples)
+        # Resto de distribuciones (respetando el orden del template)
+        for j in np.setdiff1d(np.flatnonzero(codes != _DIST_CODES['normal']), latent_rows):
+            if codes[j] == _DIST_CODES['triangular']:
+                X[j] = rng.triangular(P[j, 0], P[j, 1], P[j, 2], n_sims)
+            else:
+                rng.random(dtype=dtype, out=X[j])
+                X[j] *= dtype(P[j, 1] - P[j, 0])
+                X[j] += dtype(P[j, 0])
         
-        # Ejecutar modelo
-        outcomes = []
-        business_params = self.config.get('business_parameters')
+        self._samples_matrix = X
+        return {v['name']: X[j] for j, v in enumerate(self.variables_config)}
+    
+    def _run_fused_kernel(self, rng: np.random.Generator, n_sims: int) -> Optional[np.ndarray]:
+        """
+        Ejecuta el kernel fusionado; guarda los momentos por variable para la sensibilidad
         
-        for idx, row in df_samples.iterrows():
-            variables = row.to_dict()
-            outcome = self.model_function(variables, business_params)
-            outcomes.append(outcome)
+        Cada bloque re-siembra el generador de su hilo con un hijo de `rng.spawn`,
+        así la corrida es reproducible con la semilla sin importar cuántos hilos
+        la ejecuten. Retorna None si Numba no puede compilar el modelo.
+        """
+        n_vars = len(self.variables_config)
+        n_chunks = max(1, min(n_sims, 256))
+        outcomes = np.empty(n_sims, dtype=np.float64)
+        acc = np.zeros((n_chunks, 3 * n_vars), dtype=np.float64)
+        seeds = np.array(
+            [child.integers(2**32, dtype=np.uint32) for child in rng.spawn(n_chunks)],
+            dtype=np.uint32
+        )
         
-        df_samples['outcome'] = outcomes
-        df_samples['simulation_id'] = range(len(df_samples))
+        try:
+            self._set_numba_threads()
+            self.fused_kernel(
+                n_sims, n_chunks, seeds, self._params, _expected_values(self.variables_config),
+                self._kernel_params, outcomes, acc
+            )
+        except Exception as e:
+            logger.warning(f"Numba no pudo compilar el kernel fusionado ({e}); se muestrea por bloques.")
+            self.fused_kernel = None
+            return None
+        
+        # Filas: variables; columnas: Σd, Σd², Σd·y
+        self._fused_moments = acc.sum(axis=0).reshape(n_vars, 3)
+        return outcomes
+    
+    def _run_cuda_kernel(self, rng: np.random.Generator, n_sims: int) -> Optional[np.ndarray]:
+        """
+        Ejecuta el kernel CUDA; solo outcome y los momentos por hilo se copian al host
         
-        self.results = df_samples
+        Un estado xoroshiro128p por hilo, sembrado desde `rng`. Retorna None si
+        la GPU falla, para continuar por la ruta CPU.
+        """
+        cuda = _import_cuda()
+        n_vars = len(self.variables_config)
+        threads = 256
+        blocks = max(1, min(1024, -(-n_sims // threads)))
+        n_threads = threads * blocks
         
-        print("✅ Simulación completada\n")
+        try:
+            from numba.cuda.random import create_xoroshiro128p_states
+            
+            states = create_xoroshiro128p_states(n_threads, seed=int(rng.integers(2**63)))
+            out = cuda.device_array(n_sims, dtype=np.float64)
+            acc = cuda.device_array((n_threads, 3 * n_vars), dtype=np.float64)
+            
+            dist = cuda.to_device(self._params)
+            means = cuda.to_device(_expected_values(self.variables_config))
+            
+            self.cuda_kernel[blocks, threads](n_sims, states, dist, means, self._kernel_params, out, acc)
+            outcomes = out.copy_to_host()
+            moments = acc.copy_to_host()
+        except Exception as e:
+            logger.warning(f"Kernel CUDA falló ({e}); se usa la ruta CPU.")
+            self.cuda_kernel = None
+            return None
         
-        return df_samples
+        # Mismo layout que el kernel fusionado de CPU: (variables, [Σd, Σd², Σd·y])
+        self._fused_moments = moments.sum(axis=0).reshape(n_vars, 3)
+        return outcomes
+    
+    def _set_numba_threads(self):
+        """
+        Aplica `simulation.n_threads` a los kernels `prange` (default: todos los núcleos)
+        
+        set_num_threads es por hilo llamante, por eso se fija justo antes de cada kernel.
+        """
+        n_threads = self.config.get('simulation.n_threads')
+        if n_threads:
+            numba = _import_numba()
+            numba.set_num_threads(max(1, min(int(n_threads), numba.config.NUMBA_NUM_THREADS)))
+    
+    @staticmethod
+    def _numeric_params(business_params: Optional[dict]) -> tuple:
+        """Parámetros de negocio numéricos de primer nivel, en orden del YAML"""
+        return tuple(
+            float(v) for v in (business_params or {}).values()
+            if isinstance(v, (int, float)) and not isinstance(v, bool)
+        )
+    
+    def _run_scalar_kernel(self) -> Optional[np.ndarray]:
+        """
+        Evalúa el driver Numba sobre la matriz (n_sims, n_vars) (vista transpuesta del buffer)
+        
+        `params` es la tupla de parámetros de negocio resuelta en setup_simulation:
+        los numéricos de primer nivel en orden del YAML (variante escrita a mano)
+        o los que la variante derivada lee, en su orden. Retorna None si Numba
+        no puede compilar el modelo.
+        """
+        X = self._samples_matrix.T.astype(np.float64, copy=False)
+        outcomes = np.empty(X.shape[0], dtype=np.float64)
+        
+        try:
+            self._set_numba_threads()
+            self.scalar_kernel(X, self._kernel_params, outcomes)
+        except Exception as e:
+            logger.warning(f"Numba no pudo compilar el modelo escalar ({e}); se usa evaluación en Python.")
+            self.scalar_kernel = None
+            return None
+        
+        return outcomes
     
     def get_statistics(self) -> Dict[str, float]:
         """Calcula estadísticas de resultados"""
-        if self.results is None:
+        if self._outcomes is None:
             raise RuntimeError("❌ Debes ejecutar run() primero")
         
-        outcome = self.results['outcome']
+        outcome = self._outcomes
+        n = outcome.size
+        
+        # Con precision f32 las reducciones igual acumulan en float64 (suma por pares de NumPy)
+        
+        # Un solo np.partition fija min, max y los vecinos (lo, lo+1) de cada cuantil;
+        # los cuantiles se interpolan linealmente igual que np.quantile / pandas
+        pos = _STAT_QUANTILES * (n - 1)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.minimum(lo + 1, n - 1)
+        part = np.partition(outcome, np.unique(np.concatenate([lo, hi, [0, n - 1]])))
+        qv = part[lo] + (pos - lo) * (part[hi] - part[lo])
+        p05, p10, p25, p50, p75, p90, p95, p99 = qv.tolist()
+        
+        # CVaR: la cola izquierda ya quedó en part[:lo+1]; solo con empates en el
+        # umbral hace falta la máscara completa
+        tail = part[:lo[0] + 1]
+        if part[hi[0]] <= p05 and hi[0] != lo[0]:
+            tail = outcome[outcome <= p05]
         
         stats = {
-            'mean': float(outcome.mean()),
-            'median': float(outcome.median()),
-            'std': float(outcome.std()),
-            'min': float(outcome.min()),
-            'max': float(outcome.max()),
-            'p10': float(outcome.quantile(0.10)),
-            'p25': float(outcome.quantile(0.25)),
-            'p50': float(outcome.quantile(0.50)),
-            'p75': float(outcome.quantile(0.75)),
-            'p90': float(outcome.quantile(0.90)),
-            'p95': float(outcome.quantile(0.95)),
-            'p99': float(outcome.quantile(0.99)),
-            'prob_loss': float((outcome < 0).mean()),
-            'var_95': float(outcome.quantile(0.05)),
-            'cvar_95': float(outcome[outcome <= outcome.quantile(0.05)].mean())
+            'mean': float(outcome.mean(dtype=np.float64)),
+            'median': p50,
+            'std': float(outcome.std(ddof=1, dtype=np.float64)),
+            'min': float(part[0]),
+            'max': float(part[n - 1]),
+            'p10': p10,
+            'p25': p25,
+            'p50': p50,
+            'p75': p75,
+            'p90': p90,
+            'p95': p95,
+            'p99': p99,
+            'prob_loss': float(np.count_nonzero(outcome < 0) / n),
+            'var_95': p05,
+            'cvar_95': float(tail.mean(dtype=np.float64))
         }
         
         return stats
     
     def sensitivity_analysis(self) -> pd.DataFrame:
         """Análisis de sensibilidad simple"""
-        if self.results is None:
+        if self._outcomes is None:
             raise RuntimeError("❌ Debes ejecutar run() primero")
         
-        correlations = []
+        names = [v['name'] for v in self.variables_config]
         
-        for var_config in self.variables_config:
-            var_name = var_config['name']
-            corr = self.results[var_name].corr(self.results['outcome'])
-            
-            correlations.append({
-                'variable': var_name,
-                'correlation': abs(corr),
-                'importance': abs(corr) ** 2  # R-squared aproximado
-            })
+        if self._fused_moments is not None:
+            corrs = np.array([self._fused_correlation(j) for j in range(len(names))])
+        else:
+            # Sobre el buffer SoA (K, N): un solo gemv Xc·yc da todas las covarianzas
+            X = self._samples_matrix
+            y = self._outcomes
+            Xc = X - X.mean(axis=1, keepdims=True, dtype=np.float64)
+            yc = y - y.mean(dtype=np.float64)
+            num = Xc @ yc
+            den = np.sqrt(np.einsum('ij,ij->i', Xc, Xc) * (yc @ yc))
+            corrs = num / den
+        
+        corrs = np.abs(corrs)
         
-        df_sens = pd.DataFrame(correlations)
+        df_sens = pd.DataFrame({
+            'variable': names,
+            'correlation': corrs,
+            'importance': corrs ** 2  # R-squared aproximado
+        })
         df_sens = df_sens.sort_values('importance', ascending=False)
         df_sens = df_sens.reset_index(drop=True)
         
         return df_sens
 
+    def _fused_correlation(self, j: int) -> float:
+        """Correlación variable j ~ outcome desde los momentos del kernel fusionado"""
+        n = len(self._outcomes)
+        sum_d, sum_d2, sum_dy = self._fused_moments[j]
+        var_d = (sum_d2 - sum_d * sum_d / n) / (n - 1)
+        cov = (sum_dy - sum_d * self._outcomes.sum() / n) / (n - 1)
+        return float(cov / np.sqrt(var_d * self._outcomes.var(ddof=1)))
+    
     def evaluate_triggers(self, stats: Dict[str, float]) -> List[Dict[str, Any]]:
         """
         Evalúa los resultados estadísticos contra los umbrales de negocio (Decision Intelligence).
@@ -452,6 +1601,9 @@ class UniversalMonteCarloEngine:
         
         alerts: List[Dict[str, Any]] = []
         
+        # Un solo timestamp para todas las alertas de esta evaluación
+        timestamp = datetime.now().isoformat()
+        
         # ═══════════════════════════════════════════════════════════════
         # REGLA 1: RIESGO DE PÉRDIDA (Probabilidad vs Umbral Crítico)
         # ═══════════════════════════════════════════════════════════════
@@ -480,7 +1632,7 @@ class UniversalMonteCarloEngine:
                 'valor_actual': prob_loss,
                 'umbral_permitido': critical_threshold,
                 'mensaje': mensaje,
-                'timestamp': pd.Timestamp.now().isoformat()
+                'timestamp': timestamp
             })
         
         # ═══════════════════════════════════════════════════════════════
@@ -505,7 +1657,7 @@ class UniversalMonteCarloEngine:
                         f"📊 VOLATILIDAD ELEVADA: El coeficiente de variación ({coef_variacion:.1%}) "
                         f"supera el umbral de estabilidad ({volatility_threshold:.1%}) por {excess_pct:.0f}%."
                     ),
-                    'timestamp': pd.Timestamp.now().isoformat()
+                    'timestamp': timestamp
                 })
         
         # ═══════════════════════════════════════════════════════════════
@@ -521,7 +1673,7 @@ class UniversalMonteCarloEngine:
                 'valor_actual': p10,
                 'umbral_permitido': 0.0,
                 'mensaje': f"🔴 EXPOSICIÓN FINANCIERA: El percentil P10 (${p10:,.0f}) es negativo. Riesgo de pérdidas directas.",
-                'timestamp': pd.Timestamp.now().isoformat()
+                'timestamp': timestamp
             })
         elif mean > 0:
             margin_ratio = p10 / mean
@@ -535,7 +1687,7 @@ class UniversalMonteCarloEngine:
                         f"⚠️  MARGEN REDUCIDO: El P10 representa solo {margin_ratio:.1%} de la ganancia esperada. "
                         f"Umbral de protección: {margin_protection:.1%}."
                     ),
-                    'timestamp': pd.Timestamp.now().isoformat()
+                    'timestamp': timestamp
                 })
         
         return alerts
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Helpers compartidos de los tests
+Ejecutar desde la raíz: python3 tests/test_monte_carlo.py
+
+La corrida Monte Carlo es lo más caro de los tests: run_simulation se
+memoiza por proceso, así cada config se simula una sola vez aunque varios
+scripts la pidan.
+"""
+
+import os
+import sys
+import tempfile
+from functools import lru_cache
+
+import yaml
+
+# Raíz del repo en sys.path para `from src...` al correr los scripts sueltos
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.configuration_manager import ConfigurationManager
+from src.monte_carlo_engine import UniversalMonteCarloEngine
+
+TEMPLATE = 'templates/alimentos.yaml'
+CLIENT_CONFIG = 'clients/test_pasteleria_config.yaml'
+
+# Template del repo y config cliente mínima (sin data sources) para tests autocontenidos
+TEMPLATE_PATH = os.path.join(ROOT, 'configs', 'templates', 'alimentos.yaml')
+BASE_CLIENT = {
+    'client': {'id': 'test', 'name': 'Pastelería Test', 'industry': 'alimentos'},
+    'simulation': {'iterations': 100, 'n_simulations': 20000, 'seed': 42},
+    'variables': {
+        'precio_harina': {'distribution': 'triangular', 'params': {'min': 18.0, 'mode': 20.0, 'max': 23.0}},
+        'precio_azucar': {'distribution': 'normal', 'params': {'mean': 25.0, 'std': 2.0}},
+        'demanda_unidades': {'distribution': 'normal', 'params': {'mean': 3000.0, 'std': 400.0}},
+    },
+    'business_parameters': {
+        'precio_venta_unitario': 45,
+        'receta': {'harina': 0.5, 'azucar': 0.2},
+        'costo_fijo_mensual': 90000,
+    },
+    'data_sources': [],
+    'thresholds': {'critical_loss_prob': 0.2},
+}
+
+
+@lru_cache(maxsize=None)
+def load_config(template: str = TEMPLATE, client_config: str = CLIENT_CONFIG) -> ConfigurationManager:
+    """ConfigurationManager compartido por todos los tests (solo lectura)"""
+    return ConfigurationManager(template=template, client_config=client_config)
+
+
+@lru_cache(maxsize=None)
+def run_simulation(template: str = TEMPLATE, client_config: str = CLIENT_CONFIG):
+    """
+    Carga config, ejecuta la simulación y calcula estadísticas una sola vez por config
+
+    Returns:
+        (engine, results, stats)
+    """
+    config = load_config(template, client_config)
+
+    engine = UniversalMonteCarloEngine(config)
+    engine.load_historical_data()
+    engine.setup_simulation()
+
+    results = engine.run()
+    stats = engine.get_statistics()
+
+    return engine, results, stats
+
+
+def make_engine(client: dict, template: str = TEMPLATE_PATH) -> UniversalMonteCarloEngine:
+    """Engine con setup_simulation hecho para una config cliente en memoria (dict)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False, encoding='utf-8') as f:
+        yaml.safe_dump(client, f, sort_keys=False, allow_unicode=True)
+
+    try:
+        engine = UniversalMonteCarloEngine(ConfigurationManager(template=template, client_config=f.name))
+        engine.load_historical_data()
+        engine.setup_simulation()
+    finally:
+        os.remove(f.name)
+
+    return engine
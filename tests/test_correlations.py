@@ -0,0 +1,113 @@
+"""
+Test de correlaciones entre variables (cópula gaussiana)
+Ejecutar desde la raíz: python3 tests/test_correlations.py
+"""
+
+import copy
+
+import numpy as np
+
+from conftest import BASE_CLIENT, make_engine
+from src.monte_carlo_engine import UniversalMonteCarloEngine
+
+
+def client_with(correlations) -> dict:
+    client = copy.deepcopy(BASE_CLIENT)
+    client['correlations'] = correlations
+    return client
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    """Correlación de rangos (sin empates en muestras continuas)"""
+    return float(np.corrcoef(a.argsort().argsort(), b.argsort().argsort())[0, 1])
+
+
+print("=" * 60)
+print("TEST DE CORRELACIONES")
+print("=" * 60)
+
+# Test 1: Formato anidado y formato lista (agente de IA) producen la misma matriz
+print("\n[Test 1] Formatos de correlations...")
+try:
+    nested = make_engine(client_with({
+        'precio_harina': {'precio_azucar': 0.6},
+        'demanda_unidades': {'precio_azucar': -0.3},
+    }))
+    listed = make_engine(client_with([
+        {'var1': 'precio_harina', 'var2': 'precio_azucar', 'factor': 0.6},
+        {'var1': 'demanda_unidades', 'var2': 'precio_azucar', 'factor': -0.3},
+    ]))
+
+    assert nested._corr_factor is not None, "No se construyó el factor de Cholesky"
+    assert np.array_equal(nested._corr_rows, listed._corr_rows), "Filas correlacionadas distintas"
+    assert np.allclose(nested._corr_factor, listed._corr_factor), "Factores de Cholesky distintos"
+    print("✅ Formato anidado y lista var1/var2/factor equivalentes")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 2: Entradas mal formadas fallan con ValueError claro
+print("\n[Test 2] Entradas mal formadas...")
+malformed = [
+    [{'var1': 'precio_harina', 'factor': 0.5}],
+    [{'var1': 'precio_harina', 'var2': 'precio_azucar', 'factor': 1.5}],
+    [{'var1': 'precio_harina', 'var2': 'precio_harina', 'factor': 0.5}],
+    [['precio_harina', 'precio_azucar', 0.5]],
+    {'precio_harina': {'precio_azucar': 'alta'}},
+    {'precio_harina': 0.6},
+    'precio_harina~precio_azucar',
+]
+try:
+    for correlations in malformed:
+        try:
+            UniversalMonteCarloEngine._correlation_pairs(correlations)
+        except ValueError:
+            continue
+        raise AssertionError(f"No se rechazó: {correlations!r}")
+    print(f"✅ {len(malformed)} formatos inválidos rechazados con ValueError")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+
+# Test 3: La cópula respeta rho en pares normales y no normales, y conserva las marginales
+print("\n[Test 3] Spearman de las muestras vs rho configurado...")
+try:
+    rho_tri, rho_norm = 0.6, -0.3
+    engine = make_engine(client_with({
+        'precio_harina': {'precio_azucar': rho_tri},
+        'demanda_unidades': {'precio_azucar': rho_norm},
+    }))
+    results = engine.run()
+    harina, azucar, demanda = (
+        results[name].to_numpy() for name in ('precio_harina', 'precio_azucar', 'demanda_unidades')
+    )
+
+    # Con cópula gaussiana, Spearman = (6/π)·asin(rho/2) sea cual sea la marginal
+    for label, a, b, rho in [
+        ("triangular~normal", harina, azucar, rho_tri),
+        ("normal~normal", demanda, azucar, rho_norm),
+    ]:
+        observed = spearman(a, b)
+        expected = 6 / np.pi * np.arcsin(rho / 2)
+        assert abs(observed - expected) < 0.02, f"{label}: Spearman {observed:.3f}, esperado {expected:.3f}"
+        assert abs(observed - rho) < 0.05, f"{label}: Spearman {observed:.3f} lejos de rho {rho}"
+        print(f"✅ {label}: Spearman {observed:.3f} (rho {rho})")
+
+    harina_params = next(v['params'] for v in engine.variables_config if v['name'] == 'precio_harina')
+    lo, mode, hi = harina_params['min'], harina_params['mode'], harina_params['max']
+    assert lo <= harina.min() and harina.max() <= hi, "precio_harina fuera del soporte triangular"
+    assert abs(harina.mean() - (lo + mode + hi) / 3) < 0.02 * (hi - lo), "Media triangular alterada"
+    print("✅ Marginal triangular conservada (soporte y media)")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+print("\n" + "=" * 60)
+print("🎉 TODOS LOS TESTS DE CORRELACIONES PASARON")
+print("=" * 60)
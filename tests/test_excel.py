@@ -77,6 +77,29 @@ except Exception as e:
     print(f"❌ Error: {e}")
     exit(1)
 
+# Test 7: Limpieza con columnas object sin strings
+print("\n[Test 7] Limpiando columnas de horas, booleanos y mixtas...")
+try:
+    import datetime
+    import pandas as pd
+
+    raw = pd.DataFrame({
+        'Hora': [datetime.time(8, 30), datetime.time(17, 0)],
+        'Activo': pd.Series([True, False], dtype=object),
+        'Mixta': ['  Harina ', 3],
+    })
+    clean = connector.clean_dataframe(raw)
+    assert list(clean['Hora']) == [datetime.time(8, 30), datetime.time(17, 0)], "Hora alterada"
+    assert list(clean['Activo']) == [True, False], "Activo alterado"
+    assert list(clean['Mixta']) == ['Harina', 3], "Mixta mal limpiada"
+    print("✅ Solo se limpian celdas de texto (horas y booleanos intactos)")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
 print("\n" + "=" * 60)
 print("🎉 TODOS LOS TESTS DE EXCEL PASARON")
 print("=" * 60)
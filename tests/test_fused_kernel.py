@@ -0,0 +1,93 @@
+"""
+Test del kernel fusionado (simulation.fused_kernel): estadísticas y sensibilidad
+Ejecutar desde la raíz: python3 tests/test_fused_kernel.py
+"""
+
+import copy
+
+import numpy as np
+
+from conftest import BASE_CLIENT, make_engine
+
+print("=" * 60)
+print("TEST DE KERNEL FUSIONADO")
+print("=" * 60)
+
+client = copy.deepcopy(BASE_CLIENT)
+client['simulation']['fused_kernel'] = True
+
+# Test 1: Corrida fusionada
+print("\n[Test 1] Ejecutando kernel fusionado...")
+try:
+    fused = make_engine(client)
+    if fused.fused_kernel is None:
+        print("⚠️  Numba no instalado: se omiten los tests del kernel fusionado")
+        exit(0)
+
+    results = fused.run()
+    assert fused._fused_moments is not None, "El kernel fusionado no corrió"
+    assert list(results.columns) == ['outcome'], f"Columnas inesperadas: {list(results.columns)}"
+    print(f"✅ {len(results):,} simulaciones sin materializar samples")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 2: get_statistics == NumPy directo sobre los mismos outcomes
+print("\n[Test 2] Estadísticas vs np.percentile / mean...")
+try:
+    stats = fused.get_statistics()
+    outcome = fused._outcomes
+    p05 = np.percentile(outcome, 5)
+
+    expected = {
+        'mean': outcome.mean(),
+        'std': outcome.std(ddof=1),
+        'min': outcome.min(),
+        'max': outcome.max(),
+        'median': np.percentile(outcome, 50),
+        **{f'p{q}': np.percentile(outcome, q) for q in (10, 25, 50, 75, 90, 95, 99)},
+        'var_95': p05,
+        'cvar_95': outcome[outcome <= p05].mean(),
+        'prob_loss': np.mean(outcome < 0),
+    }
+    for key, value in expected.items():
+        assert np.isclose(stats[key], value, rtol=1e-12, atol=1e-9), \
+            f"{key}: {stats[key]} != {value}"
+    print(f"✅ {len(expected)} estadísticas coinciden con NumPy")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 3: Sensibilidad por momentos acumulados vs samples materializados
+print("\n[Test 3] Sensibilidad fusionada vs muestreo por bloques...")
+try:
+    client['simulation']['fused_kernel'] = False
+    blocks = make_engine(client)
+    blocks.run()
+
+    by_moments = fused.sensitivity_analysis().set_index('variable')['correlation']
+    by_samples = blocks.sensitivity_analysis().set_index('variable')['correlation']
+
+    # Corridas independientes: solo difieren por error Monte Carlo (~1/√N)
+    diff = (by_moments - by_samples.reindex(by_moments.index)).abs()
+    assert (diff < 0.03).all(), f"Correlaciones distintas:\n{diff}"
+    a, b = fused.get_statistics(), blocks.get_statistics()
+    stderr = np.hypot(a['std'], b['std']) / np.sqrt(fused._outcomes.size)
+    assert abs(a['mean'] - b['mean']) < 5 * stderr, "Media fusionada lejos de la ruta por bloques"
+    print(f"✅ Correlaciones por momentos dentro de {diff.max():.4f} de las muestrales")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+print("\n" + "=" * 60)
+print("🎉 TODOS LOS TESTS DEL KERNEL FUSIONADO PASARON")
+print("=" * 60)
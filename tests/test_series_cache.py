@@ -0,0 +1,117 @@
+"""
+Test del caché Parquet de series históricas (cache.ttl_seconds)
+Ejecutar desde la raíz: python3 tests/test_series_cache.py
+"""
+
+import copy
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from conftest import BASE_CLIENT, make_engine
+import src.monte_carlo_engine as mce
+
+# Fuente de BD ficticia: el test nunca llega a conectarse
+SOURCE = {
+    'type': 'database',
+    'engine': 'postgresql',
+    'host': 'data-mesh.test',
+    'database': 'sentinel_test',
+    'tables': [{
+        'table': 'fact_costos_insumos',
+        'date_column': 'fecha',
+        'value_column': 'costo_unitario',
+        'maps_to_variable': 'precio_harina',
+        'filters': {'insumo_id': 'HARINA_001'},
+    }],
+}
+
+SERIES = pd.DataFrame({
+    'fecha': pd.date_range('2024-01-01', periods=30, freq='D'),
+    'valor': np.linspace(18.0, 22.0, 30),
+})
+
+
+def engine_with_ttl(ttl: int):
+    client = copy.deepcopy(BASE_CLIENT)
+    client['cache'] = {'ttl_seconds': ttl}
+    return make_engine(client)
+
+
+print("=" * 60)
+print("TEST DE CACHÉ DE SERIES (PARQUET)")
+print("=" * 60)
+
+# Caché en un directorio temporal, no en ~/.cache/evangelista
+mce._CACHE_ROOT = Path(tempfile.mkdtemp(prefix='evangelista-test-'))
+
+# Test 1: Miss sin archivo, hit tras escribir dentro del TTL
+print("\n[Test 1] Miss inicial y hit dentro del TTL...")
+try:
+    engine = engine_with_ttl(3600)
+    pending = engine._pending_db_tables(SOURCE)
+    assert len(pending) == 1, "Sin caché la tabla debería quedar pendiente"
+
+    _, _, cache_path = pending[0]
+    engine._write_cached_series(cache_path, SERIES)
+    assert cache_path.exists(), "No se escribió el Parquet"
+
+    engine = engine_with_ttl(3600)
+    assert engine._pending_db_tables(SOURCE) == [], "La serie vigente no se sirvió desde caché"
+    assert np.array_equal(engine.historical_data['precio_harina'], SERIES['valor'].to_numpy()), \
+        "La serie cacheada no coincide con la escrita"
+    print("✅ Serie servida desde caché sin consultar la BD")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 2: Cambiar filtros o el origen cambia la clave
+print("\n[Test 2] Clave por filtros y origen...")
+try:
+    other_filter = copy.deepcopy(SOURCE)
+    other_filter['tables'][0]['filters'] = {'insumo_id': 'AZUCAR_001'}
+    other_host = dict(SOURCE, host='otro-host.test')
+
+    for label, source in [("filtro", other_filter), ("host", other_host)]:
+        pending = engine._pending_db_tables(source)
+        assert len(pending) == 1, f"Cambio de {label} sirvió la serie de otra consulta"
+        assert pending[0][2] != cache_path, f"Cambio de {label} no cambió la ruta de caché"
+    print("✅ Filtro u origen distinto -> miss")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 3: Expiración por TTL y caché desactivado con ttl_seconds: 0
+print("\n[Test 3] Expiración y desactivación...")
+try:
+    expired = time.time() - 7200
+    os.utime(cache_path, (expired, expired))
+    assert len(engine_with_ttl(3600)._pending_db_tables(SOURCE)) == 1, "Serie vencida servida desde caché"
+    assert engine_with_ttl(10800)._pending_db_tables(SOURCE) == [], "Serie dentro de un TTL mayor no servida"
+
+    disabled = engine_with_ttl(0)
+    assert len(disabled._pending_db_tables(SOURCE)) == 1, "ttl_seconds: 0 sigue leyendo el caché"
+    cache_path.unlink()
+    disabled._write_cached_series(cache_path, SERIES)
+    assert not cache_path.exists(), "ttl_seconds: 0 sigue escribiendo el caché"
+    print("✅ Vencida -> miss; ttl_seconds: 0 ni lee ni escribe")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+print("\n" + "=" * 60)
+print("🎉 TODOS LOS TESTS DE CACHÉ DE SERIES PASARON")
+print("=" * 60)
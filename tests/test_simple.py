@@ -3,7 +3,7 @@ Test simple de ConfigurationManager
 Ejecutar desde la raíz: python3 test_simple.py
 """
 
-from src.configuration_manager import ConfigurationManager
+from conftest import load_config
 
 print("=" * 60)
 print("TEST DE CONFIGURATION MANAGER")
@@ -12,10 +12,7 @@ print("=" * 60)
 # Test 1: Cargar configuración
 print("\n[Test 1] Cargando configuración...")
 try:
-    config = ConfigurationManager(
-        template='templates/alimentos.yaml',
-        client_config='clients/test_pasteleria_config.yaml'
-    )
+    config = load_config()
     print("✅ Configuración cargada exitosamente")
     print(f"   Cliente: {config.get('client.name')}")
     print(f"   Industria: {config.get('client.industry')}")
@@ -0,0 +1,125 @@
+"""
+Test de paridad: variante escalar derivada (kernel Numba) / ruta vectorizada vs modelo Python
+Ejecutar desde la raíz: python3 tests/test_specialization.py
+"""
+
+import copy
+
+import numpy as np
+
+from conftest import BASE_CLIENT, make_engine
+from src.monte_carlo_engine import _specialize_scalar_model
+
+# Modelo cuyo for reasigna su propia variable: no debe especializarse
+MODELO_REASIGNA = """
+def modelo_reasigna(variables, config):
+    costo = 0
+    for insumo, cantidad in config['receta'].items():
+        cantidad = cantidad * 1.5
+        costo += variables.get(f'precio_{insumo}', 0) * cantidad * variables['demanda_unidades']
+    return variables['demanda_unidades'] * config['precio_venta_unitario'] - costo - config['costo_fijo_mensual']
+"""
+
+# Modelo de cliente con if/max sobre variables: solo se puede evaluar por fila
+MODELO_CON_IF = """
+def modelo_cliente(variables, config):
+    demanda = variables['demanda_unidades']
+    bono = 1000.0 if demanda > 3000 else 0.0
+    margen = demanda * (config['precio_venta_unitario'] - variables['precio_harina'] * 0.5)
+    return max(margen - config['costo_fijo_mensual'], -50000.0) + bono
+"""
+
+
+def python_outcomes(engine, n: int = 2000) -> np.ndarray:
+    """Modelo Python evaluado fila a fila sobre las primeras n simulaciones ya muestreadas"""
+    names = [v['name'] for v in engine.variables_config]
+    params = engine.config.get('business_parameters')
+    X = engine._samples_matrix[:, :n].astype(np.float64)
+    return np.array([engine.model_function(dict(zip(names, col)), params) for col in X.T.tolist()])
+
+
+print("=" * 60)
+print("TEST DE ESPECIALIZACIÓN DEL MODELO ESCALAR")
+print("=" * 60)
+
+# Test 1: Modelo del template — kernel derivado == modelo Python
+print("\n[Test 1] Paridad del modelo del template...")
+try:
+    engine = make_engine(BASE_CLIENT)
+    engine.run()
+    expected = python_outcomes(engine)
+
+    if engine.scalar_kernel is None:
+        print("⚠️  Numba no instalado: se omite la comparación del kernel")
+    else:
+        kernel = engine._run_scalar_kernel()
+        assert kernel is not None, "El kernel derivado no compiló"
+        assert np.allclose(kernel[:expected.size], expected, rtol=1e-9, atol=1e-6), \
+            "El kernel derivado difiere del modelo Python"
+        print(f"✅ Kernel == Python en {expected.size:,} simulaciones")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 2: Reasignar la variable del for desactiva la especialización
+print("\n[Test 2] Modelo que reasigna la variable del for...")
+try:
+    specialized = _specialize_scalar_model(
+        MODELO_REASIGNA, 'modelo_reasigna',
+        ['precio_harina', 'precio_azucar', 'demanda_unidades'],
+        BASE_CLIENT['business_parameters']
+    )
+    assert specialized is None, "Se especializó un for que reasigna su variable"
+
+    client = copy.deepcopy(BASE_CLIENT)
+    client['business_model'] = {'template': MODELO_REASIGNA}
+    engine = make_engine(client)
+    results = engine.run()
+
+    assert engine.scalar_kernel is None, "Se derivó un kernel para el modelo que reasigna"
+    expected = python_outcomes(engine)
+    assert np.allclose(results['outcome'].to_numpy()[:expected.size], expected), \
+        "run() difiere del modelo Python"
+    print("✅ Sin especialización: run() coincide con el modelo Python")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+# Test 3: La marca vectorizada del template no se hereda al reemplazar el modelo
+print("\n[Test 3] Modelo de cliente con if sobre el template vectorizado...")
+try:
+    assert make_engine(BASE_CLIENT)._model_is_vectorized(), "El modelo del template perdió su marca"
+
+    client = copy.deepcopy(BASE_CLIENT)
+    client['business_model'] = {'template': MODELO_CON_IF}
+    engine = make_engine(client)
+    assert not engine._model_is_vectorized(), "El modelo del cliente heredó la marca vectorizada"
+    results = engine.run()
+    expected = python_outcomes(engine)
+    assert np.allclose(results['outcome'].to_numpy()[:expected.size], expected), \
+        "run() difiere del modelo Python"
+
+    # Marcado como vectorizado por error: run() cae a la evaluación por fila
+    client['business_model'] = {'template': MODELO_CON_IF + "\nmodelo_cliente.__vectorized__ = True\n"}
+    engine = make_engine(client)
+    results = engine.run()
+    expected = python_outcomes(engine)
+    assert np.allclose(results['outcome'].to_numpy()[:expected.size], expected), \
+        "El fallback por fila difiere del modelo Python"
+    print("✅ Modelo con if evaluado por fila (sin error de truth value)")
+except AssertionError as e:
+    print(f"❌ {e}")
+    exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    exit(1)
+
+print("\n" + "=" * 60)
+print("🎉 TODOS LOS TESTS DE ESPECIALIZACIÓN PASARON")
+print("=" * 60)
@@ -3,30 +3,16 @@ Test de Triggers Estocásticos
 Ejecutar: python3 test_triggers.py
 """
 
-from src.configuration_manager import ConfigurationManager
-from src.monte_carlo_engine import UniversalMonteCarloEngine
+from conftest import run_simulation
+import sys
 
 print("=" * 70)
 print("TEST DE TRIGGERS ESTOCÁSTICOS (DECISION INTELLIGENCE)")
 print("=" * 70)
 
-# Cargar configuración
-config = ConfigurationManager(
-    template='templates/alimentos.yaml',
-    client_config='clients/test_pasteleria_config.yaml'
-)
-
-# Inicializar engine
-engine = UniversalMonteCarloEngine(config)
-engine.load_historical_data()
-engine.setup_simulation()
-
-# Ejecutar simulación
+# Simulación y estadísticas (compartidas con test_monte_carlo vía conftest)
 print("\n🎲 Ejecutando simulación...\n")
-results = engine.run()
-
-# Obtener estadísticas
-stats = engine.get_statistics()
+engine, results, stats = run_simulation()
 
 print("\n📊 ESTADÍSTICAS CALCULADAS:")
 print(f"   Prob Pérdida: {stats['prob_loss']:.1%}")
@@ -59,24 +45,28 @@ try:
                 'MEDIO': '🟠'
             }.get(nivel, '⚪')
             
-            print(f"{emoji} ALERTA #{idx} [{nivel}]")
-            print(f"{'─' * 70}")
-            print(f"Métrica: {trigger['metrica']}")
-            print(f"Valor Actual: {trigger['valor_actual']:.1%}" if isinstance(trigger['valor_actual'], float) and trigger['valor_actual'] < 1 else f"Valor Actual: ${trigger['valor_actual']:,.0f}")
-            print(f"Umbral: {trigger['umbral_permitido']:.1%}" if isinstance(trigger['umbral_permitido'], float) and trigger['umbral_permitido'] < 1 else f"Umbral: ${trigger['umbral_permitido']:,.0f}")
-            print(f"\n{trigger['mensaje']}")
-            print(f"\n💡 RECOMENDACIÓN:")
-            print(f"{trigger['recomendacion']}")
+            # Un solo write por alerta
+            lines = [
+                f"{emoji} ALERTA #{idx} [{nivel}]",
+                f"{'─' * 70}",
+                f"Métrica: {trigger['metrica']}",
+                f"Valor Actual: {trigger['valor_actual']:.1%}" if isinstance(trigger['valor_actual'], float) and trigger['valor_actual'] < 1 else f"Valor Actual: ${trigger['valor_actual']:,.0f}",
+                f"Umbral: {trigger['umbral_permitido']:.1%}" if isinstance(trigger['umbral_permitido'], float) and trigger['umbral_permitido'] < 1 else f"Umbral: ${trigger['umbral_permitido']:,.0f}",
+                f"\n{trigger['mensaje']}",
+                f"\n💡 RECOMENDACIÓN:",
+                f"{trigger['recomendacion']}",
+            ]
             
             if 'contexto' in trigger:
-                print(f"\n📋 Contexto adicional:")
+                lines.append(f"\n📋 Contexto adicional:")
                 for key, value in trigger['contexto'].items():
                     if isinstance(value, float):
-                        print(f"   {key}: {value:,.2f}")
+                        lines.append(f"   {key}: {value:,.2f}")
                     else:
-                        print(f"   {key}: {value}")
+                        lines.append(f"   {key}: {value}")
             
-            print("\n")
+            lines.append("\n")
+            sys.stdout.write("\n".join(lines) + "\n")
     
     else:
         print("\n✅ NO HAY ALERTAS")